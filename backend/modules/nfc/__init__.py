@@ -7,17 +7,24 @@ to detect and read NFC tags placed on the music player device.
 
 # Import public interface functions from controller
 from .nfc_controller import (
+    NFCController,
     initialize,
     shutdown,
+    is_initialized,
+    get_reader,
     poll_for_tag,
+    poll_for_tag_raw,
     read_tag_data,
     write_tag_data,
+    read_tag_blocks,
+    write_tag_blocks,
     get_hardware_info,
     authenticate_tag,
     read_ndef_data,
     write_ndef_data,
     write_ndef_uri,
-    continuous_poll
+    continuous_poll,
+    stop_continuous_poll
 )
 
 # Import exceptions for external use
@@ -33,17 +40,24 @@ from .exceptions import (
 
 __all__ = [
     # Main controller functions
+    'NFCController',
     'initialize',
     'shutdown',
+    'is_initialized',
+    'get_reader',
     'poll_for_tag',
+    'poll_for_tag_raw',
     'read_tag_data',
     'write_tag_data',
+    'read_tag_blocks',
+    'write_tag_blocks',
     'get_hardware_info',
     'authenticate_tag',
     'read_ndef_data',
     'write_ndef_data',
     'write_ndef_uri',
     'continuous_poll',
+    'stop_continuous_poll',
     
     # Exceptions
     'NFCError',
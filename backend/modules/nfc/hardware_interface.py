@@ -2,6 +2,8 @@
 hardware_interface.py - Low-level NFC reader interface using Adafruit PN532 library.
 """
 
+import functools
+import threading
 import time
 import logging
 import board
@@ -9,36 +11,92 @@ import busio
 from adafruit_pn532.i2c import PN532_I2C
 from .exceptions import NFCHardwareError, NFCReadError, NFCWriteError, NFCNoTagError, NFCAuthenticationError, NFCTagNotWritableError
 
+# gpiozero is only needed when the PN532 IRQ line is wired to a GPIO
+try:
+    from gpiozero import DigitalInputDevice
+except ImportError:
+    DigitalInputDevice = None
+
 # Create logger
 logger = logging.getLogger(__name__)
 
+# Zero padding for an unreadable 4-byte NTAG page
+_ZERO_PAGE = bytes(4)
+
+# PN532 InDataExchange command and the NTAG2xx FAST_READ tag command it carries.
+# Pages per FAST_READ exchange are capped so each response fits one PN532 frame.
+_PN532_INDATAEXCHANGE = 0x40
+_NTAG_FAST_READ = 0x3A
+_FAST_READ_MAX_PAGES = 15
+
+# Number of UIDs whose detected tag type is remembered
+_TAG_TYPE_CACHE_SIZE = 32
+
+def _serialized(method):
+    """
+    Decorator that runs an NFCReader method while holding the reader's bus lock.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class NFCReader:
     """
     NFC reader interface using the Adafruit PN532 library.
+    
+    One instance is shared by all threads. The PN532 keeps state between a
+    command and its response (and the selected target between commands), so
+    separate per-thread handles on the same chip would corrupt each other's
+    exchanges; bus access is serialized through `lock` instead.
 
     Attributes:
         i2c_bus (int): I2C bus number (not used in Adafruit implementation, kept for API compatibility)
         i2c_address (int): I2C device address
+        i2c_address_str (str): I2C device address formatted as hex, e.g. '0x24'
+        i2c_frequency (int): Requested I2C clock rate in Hz
+        irq_pin (int): GPIO (BCM) connected to the PN532 IRQ line, or None
+        configured (bool): True once SAMConfiguration has been applied on this connection
+        lock (threading.RLock): Serializes PN532 bus transactions; hold it to
+            keep a multi-step sequence (e.g. poll, write, verify) atomic
         _pn532: PN532 device instance
         _i2c: I2C bus instance
     """
 
-    def __init__(self, i2c_bus=1, i2c_address=0x24):
+    def __init__(self, i2c_bus=1, i2c_address=0x24, i2c_frequency=400_000, irq_pin=None):
         """
         Initialize NFC reader with I2C parameters.
 
         Args:
             i2c_bus (int): I2C bus number (kept for API compatibility)
             i2c_address (int): I2C device address of the NFC HAT (default 0x24)
+            i2c_frequency (int): I2C clock rate in Hz (default 400 kHz Fast-mode).
+                On Raspberry Pi the kernel driver owns the bus clock, so this only
+                takes effect together with `dtparam=i2c_arm_baudrate` in config.txt.
+            irq_pin (int, optional): GPIO (BCM numbering) wired to the PN532 IRQ line.
+                When set, callers can sleep on the IRQ edge instead of polling.
         """
         self.i2c_bus = i2c_bus
         self.i2c_address = i2c_address
+        self.i2c_address_str = f"0x{i2c_address:02X}"
+        self.i2c_frequency = i2c_frequency
+        self.irq_pin = irq_pin
+        self.lock = threading.RLock()
         self._pn532 = None
         self._i2c = None
+        self._irq = None
         self._connected = False
+        self.configured = False
         self._last_tag_uid = None
-        logger.info(f"Initializing NFC reader on I2C bus {i2c_bus}, address 0x{i2c_address:02X}")
+        self._version = None
+        # Detected tag type per UID, so repeat operations on a tag skip the probe
+        self._tag_types = {}
+        # Reusable receive buffer for assembling a 16-byte block from NTAG pages
+        self._rx_buf = bytearray(16)
+        logger.info("Initializing NFC reader on I2C bus %s, address 0x%02X", i2c_bus, i2c_address)
 
+    @_serialized
     def connect(self):
         """
         Establish connection to the NFC hardware.
@@ -48,7 +106,7 @@ class NFCReader:
         """
         try:
             # Initialize I2C bus
-            self._i2c = busio.I2C(board.SCL, board.SDA)
+            self._i2c = busio.I2C(board.SCL, board.SDA, frequency=self.i2c_frequency)
             
             # Create PN532 instance
             self._pn532 = PN532_I2C(self._i2c, address=self.i2c_address, debug=False)
@@ -58,37 +116,153 @@ class NFCReader:
                 firmware_data = self._pn532.firmware_version
                 ic, ver, rev, support = firmware_data
                 version = f"v{ver}.{rev}"
-                logger.info(f"Connected to PN532 NFC reader: IC={ic}, Version={version}, Support={support}")
+                self._version = version
+                logger.info("Connected to PN532 NFC reader: IC=%s, Version=%s, Support=%s", ic, version, support)
                 
                 # Configure to read MiFare cards
                 self._pn532.SAM_configuration()
+                self.configured = True
+                
+                if self.irq_pin is not None:
+                    self._setup_irq()
                 
                 self._connected = True
                 return True
                 
             except Exception as e:
-                logger.error(f"Failed to get firmware version: {str(e)}")
+                logger.error("Failed to get firmware version: %s", e)
                 self.disconnect()
                 return False
                 
         except Exception as e:
-            logger.error(f"Error connecting to NFC hardware: {str(e)}")
+            logger.error("Error connecting to NFC hardware: %s", e)
             self.disconnect()
             return False
 
+    def _setup_irq(self):
+        """
+        Attach to the PN532 IRQ line. Falls back to plain polling if unavailable.
+        """
+        if DigitalInputDevice is None:
+            logger.warning("gpiozero not available, PN532 IRQ disabled; falling back to polling")
+            return
+        
+        try:
+            # IRQ is active-low and held high by the PN532 while idle
+            self._irq = DigitalInputDevice(self.irq_pin, pull_up=True)
+            logger.info("PN532 IRQ enabled on GPIO%s", self.irq_pin)
+        except Exception as e:
+            logger.warning("Could not set up PN532 IRQ on GPIO%s, falling back to polling: %s", self.irq_pin, e)
+            self._irq = None
+
+    @property
+    def irq_enabled(self):
+        """bool: True if the PN532 IRQ line is available for tag wake-ups."""
+        return self._irq is not None
+
+    @_serialized
+    def listen_for_tag(self):
+        """
+        Arm the PN532 to detect a tag without blocking.
+        
+        The PN532 asserts its IRQ line once a tag enters the field; use
+        `wait_for_irq()` to sleep until then and `read_detected_tag()` to read the UID.
+        
+        Returns:
+            bool: True if the PN532 accepted the command
+            
+        Raises:
+            NFCHardwareError: If communication with hardware fails
+        """
+        if not self._connected or not self._pn532:
+            raise NFCHardwareError("NFC reader not connected")
+        
+        try:
+            return self._pn532.listen_for_passive_target()
+        except Exception as e:
+            raise NFCHardwareError(f"Error arming tag detection: {str(e)}")
+
+    @_serialized
+    def read_detected_tag(self, timeout=0.1):
+        """
+        Read the tag found by the detection `listen_for_tag()` armed.
+        
+        Collects the response of the pending InListPassiveTarget command rather
+        than starting a new one, so a wake-up costs no second RF round trip.
+        
+        Args:
+            timeout (float): Maximum time to wait for the response in seconds
+            
+        Returns:
+            bytes or None: Tag UID if a tag was detected, None otherwise
+        """
+        if not self._connected or not self._pn532:
+            logger.error("Not connected to NFC hardware")
+            return None
+        
+        try:
+            uid = self._pn532.get_passive_target(timeout=timeout)
+        except Exception as e:
+            logger.debug("Error reading detected NFC tag: %s", e)
+            uid = None
+        
+        if uid is None:
+            self._last_tag_uid = None
+            return None
+        
+        self._last_tag_uid = bytes(uid)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tag detected with UID: %s", self._last_tag_uid.hex())
+        return self._last_tag_uid
+
+    def wait_for_irq(self, timeout):
+        """
+        Block until the PN532 asserts its IRQ line or the timeout expires.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if the IRQ fired, False on timeout or if IRQ is not configured
+        """
+        if self._irq is None:
+            return False
+        return self._irq.wait_for_active(timeout)
+
+    @_serialized
     def disconnect(self):
         """Close connection to NFC hardware."""
+        if self._irq is not None:
+            try:
+                self._irq.close()
+            except Exception as e:
+                logger.debug("Error releasing PN532 IRQ pin: %s", e)
+            self._irq = None
+        
         try:
             if self._i2c:
                 self._i2c.deinit()
                 logger.info("Disconnected from NFC hardware")
         except Exception as e:
-            logger.error(f"Error disconnecting from NFC hardware: {str(e)}")
+            logger.error("Error disconnecting from NFC hardware: %s", e)
         finally:
             self._pn532 = None
             self._i2c = None
             self._connected = False
+            self.configured = False
+            self._version = None
+            self._tag_types.clear()
 
+    def is_connected(self):
+        """
+        Check whether the reader has a live connection to the PN532.
+        
+        Returns:
+            bool: True if connected
+        """
+        return self._connected and self._pn532 is not None
+
+    @_serialized
     def reset(self):
         """
         Reset the NFC hardware.
@@ -101,32 +275,47 @@ class NFCReader:
         try:
             # Configure PN532 back to default settings
             self._pn532.SAM_configuration()
+            self.configured = True
             logger.info("NFC hardware reset completed")
             return True
         except Exception as e:
-            logger.error(f"Error resetting NFC hardware: {str(e)}")
+            logger.error("Error resetting NFC hardware: %s", e)
             raise NFCHardwareError(f"Failed to reset NFC hardware: {str(e)}")
 
-    def get_version(self):
+    def get_version(self, refresh=False):
         """
         Get firmware version from the NFC hardware.
         
+        The version is read once per connection and cached, since it cannot
+        change while the chip stays connected.
+        
+        Args:
+            refresh (bool): Query the chip again instead of using the cached value
+        
         Returns:
             str: Version string or None if failed
         """
         if not self._connected or not self._pn532:
             logger.error("Not connected to NFC hardware")
             return None
+        
+        # Served without the bus lock, so status queries from other threads
+        # never wait behind an in-progress poll or write
+        version = self._version
+        if version is not None and not refresh:
+            return version
             
         try:
-            firmware_data = self._pn532.firmware_version
+            with self.lock:
+                firmware_data = self._pn532.firmware_version
             ic, ver, rev, support = firmware_data
-            version = f"v{ver}.{rev}"
-            return version
+            self._version = f"v{ver}.{rev}"
+            return self._version
         except Exception as e:
-            logger.error(f"Error getting NFC hardware version: {str(e)}")
+            logger.error("Error getting NFC hardware version: %s", e)
             return None
 
+    @_serialized
     def poll(self):
         """
         Poll for tag presence.
@@ -144,57 +333,90 @@ class NFCReader:
             
             if uid is not None:
                 self._last_tag_uid = bytes(uid)
-                logger.debug(f"Tag detected with UID: {self._last_tag_uid.hex()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Tag detected with UID: %s", self._last_tag_uid.hex())
                 return self._last_tag_uid
                 
             self._last_tag_uid = None
             return None
             
         except Exception as e:
-            logger.error(f"Error polling for NFC tag: {str(e)}")
+            logger.error("Error polling for NFC tag: %s", e)
             self._last_tag_uid = None
             return None
 
-    def detect_tag_type(self):
+    @_serialized
+    def detect_tag_type(self, uid=None):
         """
         Attempt to detect the tag type based on the UID and other characteristics.
         
+        Args:
+            uid (bytes, optional): UID of the selected tag, as returned by poll().
+                                   Defaults to the UID of the last poll.
+        
         Returns:
             str: Tag type string ('ntag215', 'mifare_classic', 'unknown', etc.)
         """
-        if not self._last_tag_uid:
+        if uid is None:
+            uid = self._last_tag_uid
+        if not uid:
             return "unknown"
-            
+        
+        uid = bytes(uid)
+        tag_type = self._tag_types.get(uid)
+        if tag_type is None:
+            tag_type = self._probe_tag_type(uid)
+            # A failed probe may just be a badly placed tag, so only remember hits
+            if tag_type != "unknown":
+                if len(self._tag_types) >= _TAG_TYPE_CACHE_SIZE:
+                    del self._tag_types[next(iter(self._tag_types))]
+                self._tag_types[uid] = tag_type
+        return tag_type
+
+    def _probe_tag_type(self, uid):
+        """
+        Internal helper classifying the selected tag with a read or authentication attempt.
+        
+        Args:
+            uid (bytes): UID of the selected tag
+        
+        Returns:
+            str: Tag type string ('ntag215', 'mifare_classic' or 'unknown')
+        """
         # NTAG215 typically has 7-byte UIDs
-        if len(self._last_tag_uid) == 7:
+        if len(uid) == 7:
             # Try reading first page with ntag2xx method
             try:
                 # Try to read page 0 (manufacturer info)
                 data = self._pn532.ntag2xx_read_block(0)
                 if data:
-                    logger.info(f"Detected NTAG2xx tag (likely NTAG215) with UID: {self._last_tag_uid.hex()}")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Detected NTAG2xx tag (likely NTAG215) with UID: %s", uid.hex())
                     return "ntag215"
             except Exception:
                 pass
         
         # MIFARE Classic typically has 4-byte or 7-byte UIDs
-        if len(self._last_tag_uid) in [4, 7]:
+        if len(uid) in [4, 7]:
             # Try authenticating with MIFARE Classic method
             try:
                 key = [0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]  # Factory default key
                 auth_result = self._pn532.mifare_classic_authenticate_block(
-                    self._last_tag_uid, 4, 0x60, key
+                    uid, 4, 0x60, key
                 )
                 if auth_result:
-                    logger.info(f"Detected MIFARE Classic tag with UID: {self._last_tag_uid.hex()}")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Detected MIFARE Classic tag with UID: %s", uid.hex())
                     return "mifare_classic"
             except Exception:
                 pass
         
         # Default fallback
-        logger.info(f"Unknown tag type with UID: {self._last_tag_uid.hex()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Unknown tag type with UID: %s", uid.hex())
         return "unknown"
         
+    @_serialized
     def read_block(self, block_number):
         """
         Read a data block from the currently detected tag.
@@ -225,50 +447,47 @@ class NFCReader:
         try:
             # Special handling for NTAG215 tags
             if tag_type == "ntag215":
-                # For NTAG215, we need to read 4 consecutive pages to get 16 bytes
+                # For NTAG215, we need to read 4 consecutive pages to get 16 bytes,
+                # assembled in the reader's reusable receive buffer
                 start_page = block_number * 4
-                combined_data = bytearray()
+                rx = self._rx_buf
                 
                 # Read 4 consecutive pages (each page is 4 bytes)
-                for page in range(start_page, start_page + 4):
+                for i, page in enumerate(range(start_page, start_page + 4)):
+                    pos = i * 4
                     # Skip pages beyond the tag's capacity (NTAG215 has 135 pages, 0-134)
                     if page > 134:
                         # Pad with zeros if we exceed the tag's capacity
-                        combined_data.extend(bytes(4))
+                        rx[pos:pos + 4] = _ZERO_PAGE
                         continue
                         
+                    # A failed page read fails the whole block, rather than
+                    # passing zero-filled pages off as tag content
                     try:
                         page_data = self._pn532.ntag2xx_read_block(page)
-                        if page_data and len(page_data) == 4:
-                            combined_data.extend(page_data)
-                        else:
-                            # Pad with zeros if page read fails
-                            combined_data.extend(bytes(4))
                     except Exception as e:
-                        logger.debug(f"Error reading NTAG215 page {page}: {str(e)}")
-                        # Pad with zeros if page read fails
-                        combined_data.extend(bytes(4))
+                        raise NFCReadError(f"Error reading NTAG215 page {page}: {e}")
+                    if not page_data or len(page_data) != 4:
+                        raise NFCReadError(f"Failed to read NTAG215 page {page}")
+                    rx[pos:pos + 4] = page_data
                 
-                if len(combined_data) == 16:
-                    logger.debug(f"Read block {block_number} (pages {start_page}-{start_page+3}) from NTAG215")
-                    return bytes(combined_data)
-                else:
-                    logger.warning(f"Invalid data length {len(combined_data)} from NTAG215 read")
+                logger.debug("Read block %d (pages %d-%d) from NTAG215", block_number, start_page, start_page + 3)
+                return bytes(rx)
             
             # Try NTAG2xx read method for any tag (might work for NTAG215 and others)
             try:
                 data = self._pn532.ntag2xx_read_block(block_number)
                 if data and len(data) == 16:
-                    logger.debug(f"Read block {block_number} as NTAG/Ultralight")
+                    logger.debug("Read block %s as NTAG/Ultralight", block_number)
                     return bytes(data)
                 elif data and len(data) == 4:
                     # Got a single page, need to pad to 16 bytes
                     padded_data = bytearray(data)
                     padded_data.extend(bytes(12))  # Pad to 16 bytes
-                    logger.debug(f"Read page {block_number} as NTAG/Ultralight (padded to 16 bytes)")
+                    logger.debug("Read page %s as NTAG/Ultralight (padded to 16 bytes)", block_number)
                     return bytes(padded_data)
             except Exception as e:
-                logger.debug(f"NTAG read attempt failed: {str(e)}, trying other methods")
+                logger.debug("NTAG read attempt failed: %s, trying other methods", e)
             
             # If NTAG read fails, try as MIFARE Classic
             try:
@@ -292,14 +511,14 @@ class NFCReader:
                         )
                         if auth_result:
                             auth_success = True
-                            logger.debug(f"Authentication succeeded with key_type {key_type}")
+                            logger.debug("Authentication succeeded with key_type %s", key_type)
                             break
                     except Exception as auth_e:
-                        logger.debug(f"Authentication attempt failed: {str(auth_e)}")
+                        logger.debug("Authentication attempt failed: %s", auth_e)
                         continue
                 
                 if not auth_success:
-                    logger.warning(f"All authentication attempts failed for block {block_number}, trying to read anyway")
+                    logger.warning("All authentication attempts failed for block %s, trying to read anyway", block_number)
                 
                 # Read data from the specified block
                 data = self._pn532.mifare_classic_read_block(block_number)
@@ -310,7 +529,7 @@ class NFCReader:
                 return bytes(data)
                 
             except Exception as mifare_e:
-                logger.debug(f"MIFARE read attempt failed: {str(mifare_e)}")
+                logger.debug("MIFARE read attempt failed: %s", mifare_e)
                 
             # As a last resort, try a direct block read without specifying tag type
             # This might work for some tags or PN532 implementations
@@ -320,7 +539,7 @@ class NFCReader:
                 command = bytearray([0x40])  # InDataExchange command
                 command.extend([0x30, block_number])  # MIFARE Read command + block number
                 
-                logger.debug(f"Trying direct block read for block {block_number}")
+                logger.debug("Trying direct block read for block %s", block_number)
                 response = self._pn532._write_frame(command)
                 
                 if response and len(response) >= 16:
@@ -328,7 +547,7 @@ class NFCReader:
                 else:
                     raise NFCReadError(f"Invalid response from direct read: {response}")
             except Exception as direct_e:
-                logger.debug(f"Direct read attempt failed: {str(direct_e)}")
+                logger.debug("Direct read attempt failed: %s", direct_e)
                 # Fall through to the final error
                 
             # If we got here, all read attempts failed
@@ -342,6 +561,137 @@ class NFCReader:
             logger.error(error_msg)
             raise NFCReadError(error_msg)
 
+    @_serialized
+    def read_blocks(self, start_block, count):
+        """
+        Read several consecutive data blocks from the currently detected tag.
+        
+        On NTAG2xx tags each 16-byte block is fetched with a single READ command
+        (which returns four pages) instead of four separate page reads.
+
+        Args:
+            start_block (int): First block number to read
+            count (int): Number of blocks to read
+
+        Returns:
+            bytes: Concatenated block data (count * 16 bytes)
+            
+        Raises:
+            NFCNoTagError: If no tag is present
+            NFCReadError: If reading fails
+        """
+        if not self._connected or not self._pn532:
+            raise NFCHardwareError("Not connected to NFC hardware")
+            
+        if not self._last_tag_uid:
+            # Try polling first to see if there's a tag
+            if not self.poll():
+                raise NFCNoTagError("No NFC tag detected")
+        
+        buf = bytearray(count * 16)
+        for i in range(count):
+            self.read_block_into(start_block + i, buf, i * 16)
+        
+        logger.debug("Read blocks %s-%s", start_block, start_block+count-1)
+        return bytes(buf)
+
+    @_serialized
+    def ntag2xx_fast_read(self, start_page, end_page):
+        """
+        Read a range of NTAG2xx pages with FAST_READ instead of one READ per block.
+        
+        The range is fetched in as few exchanges as the PN532 frame size allows.
+
+        Args:
+            start_page (int): First page to read
+            end_page (int): Last page to read (inclusive)
+
+        Returns:
+            bytes: Page data ((end_page - start_page + 1) * 4 bytes)
+            
+        Raises:
+            NFCNoTagError: If no tag is present
+            NFCReadError: If the tag rejects FAST_READ or the exchange fails
+        """
+        if not self._connected or not self._pn532:
+            raise NFCHardwareError("Not connected to NFC hardware")
+            
+        if not self._last_tag_uid:
+            # Try polling first to see if there's a tag
+            if not self.poll():
+                raise NFCNoTagError("No NFC tag detected")
+        
+        buf = bytearray((end_page - start_page + 1) * 4)
+        page = start_page
+        while page <= end_page:
+            last = min(page + _FAST_READ_MAX_PAGES - 1, end_page)
+            length = (last - page + 1) * 4
+            try:
+                response = self._pn532.call_function(
+                    _PN532_INDATAEXCHANGE,
+                    params=[0x01, _NTAG_FAST_READ, page, last],
+                    response_length=length + 1
+                )
+            except Exception as e:
+                raise NFCReadError(f"FAST_READ of pages {page}-{last} failed: {str(e)}")
+            
+            # First byte is the PN532 status, 0x00 on success
+            if not response or response[0] != 0x00 or len(response) < length + 1:
+                raise NFCReadError(f"FAST_READ of pages {page}-{last} was rejected")
+            
+            offset = (page - start_page) * 4
+            buf[offset:offset + length] = response[1:length + 1]
+            page = last + 1
+        
+        logger.debug("Fast-read pages %s-%s", start_page, end_page)
+        return bytes(buf)
+
+    @_serialized
+    def read_block_into(self, block_number, buf, offset=0):
+        """
+        Read a data block directly into a caller-owned buffer.
+        
+        On NTAG2xx tags the block is fetched with a single READ command (which
+        returns four pages) instead of four separate page reads.
+
+        Args:
+            block_number (int): Block number to read
+            buf (bytearray): Destination buffer
+            offset (int): Byte offset in buf where the 16 block bytes are stored
+            
+        Raises:
+            NFCNoTagError: If no tag is present
+            NFCReadError: If reading fails
+        """
+        view = memoryview(buf)[offset:offset + 16]
+        if len(view) != 16:
+            raise NFCReadError(f"Buffer too small for block {block_number} at offset {offset}")
+        
+        if not self._connected or not self._pn532:
+            raise NFCHardwareError("Not connected to NFC hardware")
+            
+        if not self._last_tag_uid:
+            # Try polling first to see if there's a tag
+            if not self.poll():
+                raise NFCNoTagError("No NFC tag detected")
+        
+        if self.detect_tag_type() == "ntag215":
+            start_page = block_number * 4
+            
+            # READ wraps around past the last page, so only use it within capacity
+            if start_page + 3 <= 134:
+                try:
+                    data = self._pn532.mifare_classic_read_block(start_page)
+                    if data and len(data) >= 16:
+                        view[:] = data[:16]
+                        return
+                except Exception as e:
+                    logger.debug("NTAG READ of pages %s-%s failed: %s", start_page, start_page+3, e)
+        
+        # Fall back to the generic (page-by-page / MIFARE) path
+        view[:] = self.read_block(block_number)
+
+    @_serialized
     def is_tag_read_only(self):
         """
         Check if the currently detected tag is read-only.
@@ -362,9 +712,10 @@ class NFCReader:
             original_data = None
             try:
                 original_data = self.read_block(test_block)
-                logger.debug(f"Read data for read-only test: {original_data.hex()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Read data for read-only test: %s", original_data.hex())
             except Exception as e:
-                logger.debug(f"Could not read block {test_block} for read-only test: {str(e)}")
+                logger.debug("Could not read block %s for read-only test: %s", test_block, e)
                 return False  # If we can't read, we can't determine
                 
             # Try to write the same data back (this shouldn't modify the tag)
@@ -373,11 +724,11 @@ class NFCReader:
                 self._write_block_internal(test_block, original_data)
                 return False  # If write succeeds, tag is not read-only
             except Exception as e:
-                logger.debug(f"Write failed in read-only test: {str(e)}")
+                logger.debug("Write failed in read-only test: %s", e)
                 return True  # If write fails but read works, tag is likely read-only
                 
         except Exception as e:
-            logger.debug(f"Error in read-only test: {str(e)}")
+            logger.debug("Error in read-only test: %s", e)
             return False  # Default to assuming it's not read-only if test fails
     
     def _write_block_internal(self, block_number, data):
@@ -426,14 +777,14 @@ class NFCReader:
                 if page <= 130:  # Only write to valid user memory pages
                     try:
                         self._pn532.ntag2xx_write_block(page, page_data)
-                        logger.debug(f"Successfully wrote data to NTAG215 page {page}")
+                        logger.debug("Successfully wrote data to NTAG215 page %s", page)
                     except Exception as e:
                         success = False
-                        logger.error(f"Failed to write to NTAG215 page {page}: {str(e)}")
+                        logger.error("Failed to write to NTAG215 page %s: %s", page, e)
                         # Continue to try other pages
             
             if success:
-                logger.info(f"Successfully wrote data to NTAG215 block {block_number} (pages {start_page}-{start_page+3})")
+                logger.info("Successfully wrote data to NTAG215 block %d (pages %d-%d)", block_number, start_page, start_page + 3)
                 return True
             else:
                 raise NFCWriteError(f"Failed to write all pages for NTAG215 block {block_number}")
@@ -441,10 +792,10 @@ class NFCReader:
         # Try standard NTAG2xx write (works for some tags)
         try:
             self._pn532.ntag2xx_write_block(block_number, data[:4])  # Only write first 4 bytes
-            logger.info(f"Successfully wrote data to block {block_number} as NTAG/Ultralight (first 4 bytes)")
+            logger.info("Successfully wrote data to block %d as NTAG/Ultralight (first 4 bytes)", block_number)
             return True
         except Exception as e:
-            logger.debug(f"NTAG write attempt failed: {str(e)}, trying as MIFARE")
+            logger.debug("NTAG write attempt failed: %s, trying as MIFARE", e)
         
         # Try as MIFARE Classic
         try:
@@ -468,10 +819,10 @@ class NFCReader:
                     )
                     if auth_result:
                         auth_success = True
-                        logger.debug(f"Authentication succeeded with key_type {key_type}")
+                        logger.debug("Authentication succeeded with key_type %s", key_type)
                         break
                 except Exception as auth_e:
-                    logger.debug(f"Authentication attempt failed: {str(auth_e)}")
+                    logger.debug("Authentication attempt failed: %s", auth_e)
                     continue
             
             if not auth_success:
@@ -479,11 +830,11 @@ class NFCReader:
             
             # Write data to the specified block
             self._pn532.mifare_classic_write_block(block_number, data)
-            logger.info(f"Successfully wrote data to block {block_number} as MIFARE Classic")
+            logger.info("Successfully wrote data to block %d as MIFARE Classic", block_number)
             return True
             
         except Exception as mifare_e:
-            logger.debug(f"MIFARE write attempt failed: {str(mifare_e)}")
+            logger.debug("MIFARE write attempt failed: %s", mifare_e)
             
         # As a last resort, try a direct block write without specifying tag type
         try:
@@ -493,20 +844,21 @@ class NFCReader:
             command.extend([0xA0, block_number])  # MIFARE Write command + block number
             command.extend(data)  # Add the data to write
             
-            logger.debug(f"Trying direct block write for block {block_number}")
+            logger.debug("Trying direct block write for block %s", block_number)
             response = self._pn532._write_frame(command)
             
             if response:
-                logger.info(f"Successfully wrote data to block {block_number} using direct write")
+                logger.info("Successfully wrote data to block %d using direct write", block_number)
                 return True
             else:
                 raise NFCWriteError("No response from direct write command")
         except Exception as direct_e:
-            logger.debug(f"Direct write attempt failed: {str(direct_e)}")
+            logger.debug("Direct write attempt failed: %s", direct_e)
         
         # If we got here, all write attempts failed
         raise NFCWriteError(f"All write methods failed for block {block_number}")
     
+    @_serialized
     def write_block(self, block_number, data):
         """
         Write data to a block on the currently detected tag.
@@ -530,11 +882,8 @@ class NFCReader:
             if not self.poll():
                 raise NFCNoTagError("No NFC tag detected")
         
-        # Check if the tag is read-only
-        if self.is_tag_read_only():
-            # Use our specialized exception for read-only tags
-            raise NFCTagNotWritableError("Tag appears to be read-only or write-protected")
-        
+        # No read-only probe here: is_tag_read_only() costs a full read+write
+        # round-trip per block, so callers classify failed writes instead
         try:
             return self._write_block_internal(block_number, data)
             
@@ -543,6 +892,93 @@ class NFCReader:
             logger.error(error_msg)
             raise NFCWriteError(error_msg)
 
+    @_serialized
+    def write_then_read_block(self, block_number, data):
+        """
+        Write a block and immediately read it back, without releasing the bus.
+        
+        The PN532 only answers the write command once the tag has acknowledged
+        it, so the read-back can follow straight away with no settling delay.
+
+        Args:
+            block_number (int): Block number to write
+            data (bytes): Data to write (must be 16 bytes)
+
+        Returns:
+            bytes: Block data read back after the write (16 bytes)
+            
+        Raises:
+            NFCNoTagError: If no tag is present
+            NFCWriteError: If writing fails
+            NFCReadError: If the read-back fails
+        """
+        if not self.write_block(block_number, data):
+            raise NFCWriteError(f"Failed to write data to block {block_number}")
+        
+        # Read back with a single READ on NTAG2xx rather than four page reads
+        buf = bytearray(16)
+        self.read_block_into(block_number, buf)
+        return bytes(buf)
+
+    @_serialized
+    def write_blocks(self, start_block, data_blocks):
+        """
+        Write several consecutive blocks back-to-back on the currently detected tag.
+        
+        No verification or settling delay is done between blocks; callers verify
+        the whole range afterwards with read_blocks().
+
+        Args:
+            start_block (int): First block number to write
+            data_blocks (list): Block data, each entry exactly 16 bytes
+
+        Returns:
+            bool: True if all blocks were written
+            
+        Raises:
+            NFCNoTagError: If no tag is present
+            NFCWriteError: If writing any block fails
+        """
+        if not self._connected or not self._pn532:
+            raise NFCHardwareError("Not connected to NFC hardware")
+            
+        if not self._last_tag_uid:
+            # Try polling first to see if there's a tag
+            if not self.poll():
+                raise NFCNoTagError("No NFC tag detected")
+        
+        for offset, data in enumerate(data_blocks):
+            block_number = start_block + offset
+            try:
+                self._write_block_internal(block_number, data)
+            except Exception as e:
+                error_msg = f"Error writing to block {block_number}: {str(e)}"
+                logger.error(error_msg)
+                raise NFCWriteError(error_msg)
+        
+        return True
+
+    @_serialized
+    def write_then_read_blocks(self, start_block, data_blocks):
+        """
+        Write consecutive blocks and read the whole range back, without releasing the bus.
+
+        Args:
+            start_block (int): First block number to write
+            data_blocks (list): Block data, each entry exactly 16 bytes
+
+        Returns:
+            bytes: Data read back from the written range (len(data_blocks) * 16 bytes)
+            
+        Raises:
+            NFCNoTagError: If no tag is present
+            NFCWriteError: If writing any block fails
+            NFCReadError: If the read-back fails
+        """
+        self.write_blocks(start_block, data_blocks)
+        return self.read_blocks(start_block, len(data_blocks))
+
+    @_serialized
     def authenticate(self, block_number, key_type='A', key=b'\xFF\xFF\xFF\xFF\xFF\xFF'):
         """
         Authenticate with a MIFARE tag before reading/writing protected blocks.
@@ -583,7 +1019,7 @@ class NFCReader:
             )
             
             if result:
-                logger.info(f"Successfully authenticated for block {block_number}")
+                logger.info("Successfully authenticated for block %d", block_number)
                 return True
                 
             logger.error("Authentication failed")
@@ -6,8 +6,12 @@ robust error handling and improved performance for read/write operations.
 """
 
 import logging
+import random
+import re
+import struct
 import threading
 import time
+from contextlib import contextmanager
 from .hardware_interface import NFCReader
 from .tag_processor import format_uid, parse_ndef_data, create_ndef_data
 from .exceptions import (
@@ -18,75 +22,1684 @@ from .exceptions import (
 # Configure logger
 logger = logging.getLogger(__name__)
 
-# Global reader instance (singleton pattern)
-_nfc_reader = None
-_reader_lock = threading.Lock()
-_initialized = False
+class _RWLock:
+    """
+    Readers-writer lock with reader preference.
+    
+    Any number of threads may hold the read side at once; the write side is
+    exclusive. The writing thread may re-enter either side, so initialize() can
+    be reached from inside a write-locked operation, and a reader may nest
+    further read acquisitions. A reader must not try to take the write side.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+    
+    def acquire_read(self):
+        with self._cond:
+            if self._writer != threading.get_ident():
+                while self._writer is not None:
+                    self._cond.wait()
+            self._readers += 1
+    
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+    
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writer = me
+            self._write_depth = 1
+    
+    def release_write(self):
+        with self._cond:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+    
+    @contextmanager
+    def read_lock(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write_lock(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+# Zero bytes used to pad short writes up to a full 16-byte block
+_ZERO_PAD16 = b'\x00' * 16
+
+# Longest continuous_poll() sleeps on the IRQ line between checks of its exit event
+_IRQ_EXIT_CHECK = 0.05
+
+# URIs accepted by write_ndef_uri()
+_URI_RE = re.compile(r'^https?://', re.IGNORECASE)
+
+# Write retry backoff: base delay doubled per attempt up to a cap, plus jitter
+# so retries from a wobbling tag do not hammer the bus in lockstep
+_WRITE_RETRY_BASE = 0.01
+_WRITE_RETRY_MAX = 0.2
+_WRITE_RETRY_JITTER = 0.005
+
+def _write_retry_delay(attempt):
+    """
+    Internal helper computing the backoff before retrying a failed write.
+    
+    Args:
+        attempt (int): Zero-based number of the attempt that just failed
+        
+    Returns:
+        float: Delay in seconds
+    """
+    delay = min(_WRITE_RETRY_BASE * (2 ** attempt), _WRITE_RETRY_MAX)
+    delay += random.uniform(0, _WRITE_RETRY_JITTER)
+    logger.debug("Backing off %.3f s before write retry", delay)
+    return delay
+
+def _attempt_write(reader, block, data, verify):
+    """
+    Internal helper for a single write (and optional verify) attempt of one block.
+    
+    Args:
+        reader (NFCReader): Active reader
+        block (int): Block number to write to
+        data (bytes): Block data, exactly 16 bytes
+        verify (bool): Whether to read the block back and compare
+        
+    Returns:
+        NFCError or None: None on success, otherwise the retryable error of this attempt
+        
+    Raises:
+        NFCNoTagError: If no tag is present
+        NFCHardwareError: If the reader is not connected
+    """
+    try:
+        if not verify:
+            if not reader.write_block(block, data):
+                return NFCWriteError(f"Failed to write data to block {block}")
+            return None
+        
+        # Write and read back in one bus sequence
+        read_data = reader.write_then_read_block(block, data)
+    except (NFCReadError, NFCWriteError) as e:
+        return e
+    
+    if read_data != data:
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("Expected: %s, Got: %s", data.hex(), read_data.hex())
+        return NFCWriteError(f"Data verification failed for block {block}")
+    
+    return None
+
+def _first_mismatched_block(read_data, expected):
+    """
+    Internal helper returning the index of the first 16-byte block that differs.
+    
+    Args:
+        read_data (bytes): Data read back from the tag
+        expected (bytes): Data that was written
+        
+    Returns:
+        int: Zero-based block index of the first difference
+    """
+    got = memoryview(read_data)
+    want = memoryview(expected)
+    for offset in range(0, len(want), 16):
+        if got[offset:offset + 16] != want[offset:offset + 16]:
+            return offset // 16
+    # Same content but different length (short read)
+    return len(want) // 16
+
+class _SPSCRing:
+    """
+    Fixed-size single-producer/single-consumer ring buffer.
+    
+    Only the producer advances `tail` and only the consumer advances `head`, so
+    the two threads never need a lock between them. When the ring is full new
+    items are dropped rather than blocking the producer.
+    """
+    
+    def __init__(self, size=16):
+        # Size must be a power of two so indices can be masked
+        self._buf = [None] * size
+        self._mask = size - 1
+        self.head = 0
+        self.tail = 0
+        # Wakes the consumer when an item is published
+        self.ready = threading.Event()
+    
+    def put(self, item):
+        tail = self.tail
+        if tail - self.head > self._mask:
+            return False
+        self._buf[tail & self._mask] = item
+        self.tail = tail + 1
+        self.ready.set()
+        return True
+    
+    def get(self):
+        head = self.head
+        if head == self.tail:
+            return None
+        index = head & self._mask
+        item = self._buf[index]
+        self._buf[index] = None
+        self.head = head + 1
+        return item
+
+# Placeholder for ndef_data in a ring event, marking the tag as removed
+_TAG_REMOVED = object()
+
+def _dispatch_tag_events(ring, callback, read_ndef, done, on_remove=None):
+    """
+    Internal consumer loop that runs the continuous_poll callbacks off the poll thread.
+    
+    Args:
+        ring (_SPSCRing): Ring of (uid, ndef_data) events from the poll loop;
+                          ndef_data is _TAG_REMOVED for removal events
+        callback (function): User callback
+        read_ndef (bool): Whether to pass NDEF data to the callback
+        done (threading.Event): Set by the poll loop when it exits; queued
+                                events are still delivered before returning
+        on_remove (function, optional): User callback for removal events
+    """
+    while True:
+        # Clear before checking so a put() between get() and wait() is not missed
+        ring.ready.clear()
+        item = ring.get()
+        if item is None:
+            if done.is_set():
+                return
+            ring.ready.wait(0.5)
+            continue
+        
+        uid, ndef_data = item
+        if ndef_data is _TAG_REMOVED:
+            try:
+                on_remove(uid)
+            except Exception as e:
+                logger.error("Error in tag removal callback: %s", e)
+            continue
+        
+        try:
+            if read_ndef:
+                callback(uid, ndef_data)
+            else:
+                callback(uid)
+        except Exception as e:
+            logger.error("Error in tag detection callback: %s", e)
+
+def _queue_tag_removal(ring, uid, on_remove):
+    """
+    Internal helper to hand a tag removal to the continuous_poll consumer thread.
+    
+    Args:
+        ring (_SPSCRing): Event ring read by _dispatch_tag_events()
+        uid (str): Formatted UID of the removed tag
+        on_remove (function or None): Removal callback; nothing is queued without one
+    """
+    logger.debug("Tag removed: %s", uid)
+    if on_remove is not None and not ring.put((uid, _TAG_REMOVED)):
+        logger.warning("Tag event queue full, dropping removal of %s", uid)
+
+class NFCController:
+    """
+    NFC controller owning one reader together with its locks and caches.
+    
+    The module-level functions below operate on a default instance. Further
+    instances can drive readers on other I2C buses independently.
+    """
+    
+    def __init__(self):
+        # Active reader. Reads share the read side of _lock; initialize(),
+        # shutdown() and tag writes take the write side. Individual PN532
+        # transactions are additionally serialized by the reader's own bus
+        # lock, which is all a bare UID poll needs, so polls take no controller
+        # lock. Tag writes also hold the bus lock across their whole presence
+        # check, write and verify sequence, which keeps polls out of it. Call
+        # _get_reader() before taking the read side, since it may need to
+        # initialize.
+        self._reader = None
+        self._lock = _RWLock()
+        self.initialized = False
+        
+        # NDEF content of the tag currently on the reader, as (uid, ndef_data).
+        # Lets repeated polls of a tag that stays in place skip re-reading its
+        # NDEF blocks.
+        self._ndef_cache = (None, None)
+        
+        # Last raw UID seen by a poll and its formatted string, as
+        # (raw_uid, uid). A tag resting on the reader returns the same raw UID
+        # on every poll.
+        self._uid_cache = (None, None)
+        
+        # Exit event used by continuous_poll() when the caller does not pass
+        # one; set it with stop_continuous_poll(). The last loop using it
+        # clears it on exit, counted under _exit_users_lock
+        self._exit_event = threading.Event()
+        self._exit_users = 0
+        self._exit_users_lock = threading.Lock()
+        
+        # Connection parameters of the last initialize() call, reused when the
+        # controller has to reconnect on its own
+        self._init_args = {'i2c_bus': 1, 'i2c_address': 0x24, 'i2c_frequency': 400_000, 'irq_pin': None}
+    
+    def initialize(self, i2c_bus=1, i2c_address=0x24, retries=3, i2c_frequency=400_000, irq_pin=None):
+        """
+        Initialize the NFC controller and hardware.
+        
+        Args:
+            i2c_bus (int): I2C bus number (usually 1 on Raspberry Pi)
+            i2c_address (int): I2C device address of the NFC HAT
+            retries (int): Number of connection retries before failing
+            i2c_frequency (int): I2C clock rate in Hz (default 400 kHz Fast-mode)
+            irq_pin (int, optional): GPIO (BCM) wired to the PN532 IRQ line. When set,
+                                     continuous_poll() sleeps until the IRQ fires instead of
+                                     polling on a timer.
+        
+        Returns:
+            bool: True if initialization successful, False otherwise
+        """
+        with self._lock.write_lock():
+            self._init_args = {'i2c_bus': i2c_bus, 'i2c_address': i2c_address,
+                               'i2c_frequency': i2c_frequency, 'irq_pin': irq_pin}
+            
+            # Return early if the existing reader is still connected; this keeps the
+            # last seen tag and the NDEF cache across spurious re-initialization
+            if self._reader is not None and self._reader.is_connected():
+                logger.debug("NFC controller already initialized")
+                self.initialized = True
+                return True
+                
+            self.initialized = False
+            
+            # Try initialization with retries
+            reader = None
+            for attempt in range(retries):
+                try:
+                    # Clean up previous instance if it exists
+                    if self._reader is not None:
+                        try:
+                            self._reader.disconnect()
+                        except Exception as e:
+                            logger.debug("Error disconnecting previous reader: %s", e)
+                        self._reader = None
+                    
+                    # Create new reader instance
+                    reader = NFCReader(i2c_bus, i2c_address, i2c_frequency, irq_pin)
+                    
+                    # Connect to hardware
+                    if not reader.connect():
+                        logger.error("Failed to connect to NFC hardware (attempt %s/%s)", attempt+1, retries)
+                        time.sleep(0.5)  # Brief delay before retry
+                        continue
+                    
+                    # Reset hardware to ensure clean state, unless connect() already
+                    # applied the SAM configuration
+                    if not reader.configured:
+                        reader.reset()
+                    
+                    # Publish only a fully connected reader; lock-free readers of
+                    # _reader see either None or a ready instance
+                    self._reader = reader
+                    self.initialized = True
+                    logger.info("NFC controller initialized successfully on bus %s, address 0x%02X", i2c_bus, i2c_address)
+                    return True
+                    
+                except Exception as e:
+                    logger.error("Error during NFC initialization (attempt %s/%s): %s", attempt+1, retries, e)
+                    if reader:
+                        try:
+                            reader.disconnect()
+                        except Exception:
+                            pass
+                        reader = None
+                    
+                    # Wait before retrying, increasing delay with each attempt
+                    time.sleep(0.5 * (attempt + 1))
+            
+            # If we get here, all retries failed
+            self._reader = None
+            logger.error("NFC initialization failed after %s attempts", retries)
+            return False
+
+    def shutdown(self):
+        """
+        Clean shutdown of NFC hardware.
+        
+        Returns:
+            bool: True if shutdown successful, False if errors occurred
+        """
+        with self._lock.write_lock():
+            reader = self._reader
+            if not reader:
+                logger.debug("NFC controller already shut down or not initialized")
+                self.initialized = False
+                return True
+            
+            # Unpublish before disconnecting, so lock-free loads in _get_reader()
+            # never hand out a reader that is being torn down
+            self._reader = None
+            self.initialized = False
+            self._invalidate_ndef_cache()
+            
+            try:
+                reader.disconnect()
+                logger.info("NFC controller shut down successfully")
+                return True
+            except Exception as e:
+                logger.error("Error during NFC shutdown: %s", e)
+                return False
+
+    def _invalidate_ndef_cache(self):
+        """
+        Internal helper to drop cached NDEF data after the tag contents may have changed.
+        """
+        self._ndef_cache = (None, None)
+
+    def _ensure_initialized(self):
+        """
+        Internal helper to ensure NFC controller is initialized before operations.
+        
+        Raises:
+            NFCHardwareError: If NFC controller is not initialized
+        """
+        if not self.initialized or self._reader is None:
+            error_msg = "NFC controller not initialized"
+            logger.error(error_msg)
+            raise NFCHardwareError(error_msg)
+
+    def _reinitialize_if_needed(self):
+        """
+        Internal helper to attempt re-initialization if connection seems broken.
+        
+        Returns:
+            bool: True if reinitialization successful or not needed, False otherwise
+        """
+        if not self.initialized or self._reader is None:
+            logger.warning("Attempting to reinitialize NFC controller")
+            # Reconnect with the parameters of the last initialize() call (the
+            # defaults if there was none), so bus, clock rate and IRQ pin survive
+            return self.initialize(**self._init_args)
+        
+        return True
+
+    def _get_reader(self):
+        """
+        Internal helper returning the active reader, (re)initializing on the slow path.
+        
+        The common case is a single lock-free load of _reader: initialize() only
+        publishes a reader once it is connected, and bus access is serialized by the
+        reader's own lock, so no controller lock is needed here.
+        
+        Returns:
+            NFCReader: The active reader
+            
+        Raises:
+            NFCHardwareError: If NFC controller is not initialized and cannot be
+        """
+        reader = self._reader
+        if reader is not None:
+            return reader
+        
+        try:
+            self._ensure_initialized()
+        except NFCHardwareError as e:
+            if not self._reinitialize_if_needed():
+                raise e
+        
+        reader = self._reader
+        if reader is None:
+            raise NFCHardwareError("NFC controller not initialized")
+        return reader
+
+    def get_reader(self):
+        """
+        Get the reader opened by initialize(), for direct hardware access.
+        
+        The reader stays owned by the controller: it is closed by shutdown() and
+        must not be disconnected by the caller.
+        
+        Returns:
+            NFCReader: The active reader
+            
+        Raises:
+            NFCHardwareError: If NFC controller is not initialized and cannot be
+        """
+        return self._get_reader()
+
+    def poll_for_tag_raw(self, retries=2):
+        """
+        Check for presence of an NFC tag and return its raw UID.
+        
+        Cheaper than poll_for_tag() when the UID is only compared, e.g. to notice
+        that a different tag was placed on the reader.
+        
+        Args:
+            retries (int): Number of retries if initial poll fails
+        
+        Returns:
+            bytes or None: Raw tag UID if tag found, None otherwise
+        """
+        # Ensure NFC controller is initialized
+        try:
+            reader = self._get_reader()
+        except NFCHardwareError:
+            return None
+        
+        # Multiple attempts to improve reliability
+        for attempt in range(retries + 1):
+            # Only hardware-layer failures are retried; anything else is a bug
+            # and propagates instead of being logged as a failed poll
+            try:
+                raw_uid = reader.poll()
+            except (NFCError, OSError) as e:
+                if attempt < retries:
+                    logger.debug("Poll attempt %s failed: %s, retrying...", attempt+1, e)
+                    time.sleep(0.05)  # Short delay before retry
+                    continue
+                logger.error("Error polling for NFC tag after %s attempts: %s", retries+1, e)
+                return None
+            
+            if raw_uid:
+                return raw_uid
+            
+            if attempt < retries:
+                time.sleep(0.05)  # Short delay before retry
+        
+        # No tag on the reader, forget everything cached for the previous one
+        self._ndef_cache = (None, None)
+        self._format_uid_cached(None)
+        return None
+
+    def poll_for_tag(self, read_ndef=False, timeout=0.1, retries=2):
+        """
+        Check for presence of an NFC tag and optionally read NDEF data.
+        
+        Args:
+            read_ndef (bool): Whether to attempt to read NDEF data from the tag
+            timeout (float): Timeout in seconds for the polling operation
+            retries (int): Number of retries if initial poll fails
+        
+        Returns:
+            tuple or str or None: 
+                - If read_ndef=True and successful: (uid_str, ndef_data)
+                - If read_ndef=True but no NDEF data: (uid_str, None)
+                - If read_ndef=False: uid_str if tag found, None otherwise
+        """
+        raw_uid = self.poll_for_tag_raw(retries)
+        if raw_uid is None:
+            return None
+        
+        # Format UID (reused while the same tag stays on the reader)
+        uid = self._format_uid_cached(raw_uid)
+        logger.debug("NFC tag detected: %s", uid)
+        
+        # If we don't need to read NDEF data, just return the UID
+        if not read_ndef:
+            return uid
+        
+        # Return tuple of UID and NDEF data (which may be None)
+        return (uid, self._read_ndef_for_uid(uid))
+
+    def _read_ndef_for_uid(self, uid):
+        """
+        Internal helper returning the NDEF data of the tag on the reader.
+        
+        The result is cached per UID, so a tag that stays in place is only read once.
+        
+        Args:
+            uid (str): Formatted UID of the tag currently on the reader
+            
+        Returns:
+            dict or None: Parsed NDEF data, or None if unavailable
+        """
+        # Same tag still on the reader, reuse its NDEF data
+        cached_uid, cached_ndef = self._ndef_cache
+        if uid == cached_uid:
+            return cached_ndef
+        
+        # Attempt to read NDEF data from the tag. Read and cache under one hold
+        # of the read side, so a tag write cannot slip in between and leave
+        # the old content cached. Only a complete read that parsed into records
+        # is cached: a failed block or page read raises before the cache is
+        # written, and a blank or unparsable tag is simply read again on the
+        # next poll
+        ndef_data = None
+        try:
+            self._get_reader()
+            with self._lock.read_lock():
+                ndef_data = self._read_ndef_data_internal(allow_partial=False)
+                if ndef_data and ndef_data.get('records'):
+                    self._ndef_cache = (uid, ndef_data)
+            if ndef_data:
+                logger.debug("Read NDEF data during polling: %s records", len(ndef_data.get('records', [])))
+        except Exception as e:
+            logger.debug("Unable to read NDEF data during polling: %s", e)
+        
+        return ndef_data
+
+    def _format_uid_cached(self, raw_uid):
+        """
+        Internal helper to format a raw UID, reusing the result for a repeated UID.
+        
+        Args:
+            raw_uid (bytes): Raw UID from the reader, or None to clear the cache
+            
+        Returns:
+            str or None: Formatted UID, or None if raw_uid is None
+        """
+        if raw_uid is None:
+            self._uid_cache = (None, None)
+            return None
+        
+        cached_raw, cached_uid = self._uid_cache
+        if raw_uid == cached_raw:
+            return cached_uid
+        
+        uid = format_uid(raw_uid)
+        self._uid_cache = (raw_uid, uid)
+        return uid
+
+    def _poll_uid_only(self):
+        """
+        Internal helper for a single presence check that returns the tag UID only.
+        
+        Unlike poll_for_tag(), this never reads NDEF data and does not retry.
+        
+        Returns:
+            str or None: Formatted UID if a tag is present, None otherwise
+            
+        Raises:
+            NFCHardwareError: If communication with hardware fails
+        """
+        reader = self._reader
+        if reader is None:
+            return None
+        
+        raw_uid = reader.poll()
+        return self._format_uid_cached(raw_uid or None)
+
+    def read_tag_data(self, block=4, retries=3):
+        """
+        Read data from a specific block on the currently present tag.
+        
+        Args:
+            block (int): Block number to read from
+            retries (int): Number of read retries if failures occur
+        
+        Returns:
+            bytes: Data read from the tag
+        
+        Raises:
+            NFCReadError: If reading fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+        """
+        buf = bytearray(16)
+        self._read_tag_data_into(block, buf, 0, retries)
+        return bytes(buf)
+
+    def _read_tag_data_into(self, block, buf, offset=0, retries=3):
+        """
+        Internal helper to read one block into a caller-owned buffer.
+        
+        Args:
+            block (int): Block number to read from
+            buf (bytearray): Destination buffer
+            offset (int): Byte offset in buf for the 16 block bytes
+            retries (int): Number of read retries if failures occur
+        
+        Raises:
+            NFCReadError: If reading fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+        """
+        # Ensure NFC controller is initialized
+        reader = self._get_reader()
+        
+        for attempt in range(retries + 1):
+            try:
+                # Read block data straight into the destination window
+                with self._lock.read_lock():
+                    reader.read_block_into(block, buf, offset)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Data read from block %d: %s", block, buf[offset:offset + 16].hex())
+                return
+                
+            except NFCNoTagError:
+                # No point retrying if tag isn't present
+                logger.warning("No tag present when trying to read")
+                raise
+                
+            except (NFCError, OSError) as e:
+                if attempt < retries:
+                    logger.debug("Read attempt %s failed: %s, retrying...", attempt+1, e)
+                    time.sleep(0.1)  # Slightly longer delay for read retries
+                    continue
+                else:
+                    error_msg = f"Error reading tag data from block {block} after {retries+1} attempts: {e}"
+                    logger.error(error_msg)
+                    raise NFCReadError(error_msg)
+
+    def write_tag_data(self, data, block=4, verify=True, max_retries=3):
+        """
+        Write data to a specific block on the currently present tag.
+        
+        Args:
+            data (bytes or str): Data to write (must be 16 bytes or less)
+            block (int): Block number to write to
+            verify (bool): Whether to verify the data was written correctly
+            max_retries (int): Maximum number of retry attempts if verification fails
+        
+        Returns:
+            bool: True if write successful
+        
+        Raises:
+            NFCWriteError: If writing fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+            NFCTagNotWritableError: If tag is read-only
+        """
+        # Already block-sized bytes need no normalization
+        if type(data) is bytes and len(data) == 16:
+            return self._write_tag_data_raw(data, block, verify, max_retries)
+        
+        # Ensure data is bytes
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        # Validate data length
+        if len(data) > 16:
+            error_msg = f"Data too long ({len(data)} bytes). Maximum is 16 bytes per block."
+            logger.error(error_msg)
+            raise NFCWriteError(error_msg)
+        
+        # Copy into a zeroed block-sized buffer, padding short data in the same step
+        buf = bytearray(16)
+        buf[:len(data)] = data
+        
+        return self._write_tag_data_raw(bytes(buf), block, verify, max_retries)
+
+    def _write_tag_data_raw(self, data, block, verify, max_retries):
+        """
+        Internal helper to write one block that is already exactly 16 bytes.
+        
+        Args:
+            data (bytes): Block data, already padded to exactly 16 bytes
+            block (int): Block number to write to
+            verify (bool): Whether to verify the data was written correctly
+            max_retries (int): Maximum number of retry attempts if verification fails
+        
+        Returns:
+            bool: True if write successful
+        
+        Raises:
+            NFCWriteError: If writing fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+            NFCTagNotWritableError: If tag is read-only
+        """
+        # Ensure NFC controller is initialized
+        reader = self._get_reader()
+        
+        # Writes change tag state; the write side excludes reads, and the bus
+        # lock (re-entered by each reader call) keeps polls from other threads
+        # out of the whole presence check, write and verify sequence
+        with self._lock.write_lock(), reader.lock:
+            # Try to poll for tag first to ensure it's present
+            if not reader.poll():
+                raise NFCNoTagError("No NFC tag detected")
+            
+            # Tag contents are about to change
+            self._invalidate_ndef_cache()
+            
+            # Write with retries
+            for attempt in range(max_retries + 1):
+                error = _attempt_write(reader, block, data, verify)
+                if error is None:
+                    logger.info("Successfully wrote data to block %d", block)
+                    return True
+                
+                if attempt < max_retries:
+                    logger.warning("Write to block %s failed, retrying (%s/%s): %s", block, attempt+1, max_retries, error)
+                    time.sleep(_write_retry_delay(attempt))
+            
+            # All attempts exhausted; tell a write-protected tag from a failed write
+            if self._write_was_rejected(block, data):
+                error_msg = f"Tag appears to be read-only or write-protected: {error}"
+                logger.warning(error_msg)
+                raise NFCTagNotWritableError(error_msg)
+            
+            error_msg = f"Error writing tag data to block {block} after {max_retries} retries: {error}"
+            logger.error(error_msg)
+            raise NFCWriteError(error_msg)
+
+    def read_tag_blocks(self, start_block=4, count=1, retries=3):
+        """
+        Read several consecutive blocks from the currently present tag.
+        
+        Args:
+            start_block (int): First block number to read
+            count (int): Number of blocks to read
+            retries (int): Number of read retries if failures occur
+        
+        Returns:
+            bytes: Concatenated block data (count * 16 bytes)
+        
+        Raises:
+            NFCReadError: If reading fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+        """
+        # Ensure NFC controller is initialized
+        reader = self._get_reader()
+        
+        for attempt in range(retries + 1):
+            try:
+                with self._lock.read_lock():
+                    data = reader.read_blocks(start_block, count)
+                if data and len(data) == count * 16:
+                    return data
+                else:
+                    raise NFCReadError(f"Invalid data length from blocks {start_block}-{start_block+count-1}: {len(data) if data else 0} bytes")
+                
+            except NFCNoTagError:
+                # No point retrying if tag isn't present
+                logger.warning("No tag present when trying to read")
+                raise
+                
+            except (NFCError, OSError) as e:
+                if attempt < retries:
+                    logger.debug("Multi-block read attempt %s failed: %s, retrying...", attempt+1, e)
+                    time.sleep(0.1)
+                    continue
+                else:
+                    error_msg = f"Error reading tag data from blocks {start_block}-{start_block+count-1} after {retries+1} attempts: {e}"
+                    logger.error(error_msg)
+                    raise NFCReadError(error_msg)
+
+    def write_tag_blocks(self, data, start_block=4, verify=True, max_retries=3):
+        """
+        Write data spanning several consecutive blocks on the currently present tag.
+        
+        All blocks are written back-to-back and then verified with a single read of
+        the whole range, instead of a write/wait/read cycle per block. On a
+        verification mismatch the entire range is rewritten.
+        
+        Args:
+            data (bytes or str): Data to write, zero-padded to a multiple of 16 bytes
+            start_block (int): First block number to write to
+            verify (bool): Whether to verify the data was written correctly
+            max_retries (int): Maximum number of retry attempts if writing or verification fails
+        
+        Returns:
+            bool: True if write successful
+        
+        Raises:
+            NFCWriteError: If writing fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+            NFCTagNotWritableError: If tag is read-only
+        """
+        # Ensure NFC controller is initialized
+        reader = self._get_reader()
+        
+        # Writes change tag state; the write side excludes reads, and the bus
+        # lock (re-entered by each reader call) keeps polls from other threads
+        # out of the whole presence check, write and verify sequence
+        with self._lock.write_lock(), reader.lock:
+            # Ensure data is bytes
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            
+            if not data:
+                raise NFCWriteError("No data to write")
+            
+            # Pad data to a whole number of blocks
+            remainder = len(data) % 16
+            if remainder:
+                data = data + _ZERO_PAD16[remainder:]
+            
+            blocks = [data[i:i+16] for i in range(0, len(data), 16)]
+            end_block = start_block + len(blocks) - 1
+            
+            # Try to poll for tag first to ensure it's present
+            if not reader.poll():
+                raise NFCNoTagError("No NFC tag detected")
+            
+            # Tag contents are about to change
+            self._invalidate_ndef_cache()
+            
+            # First block as read back by each failed verify, for classifying
+            # a write that never succeeds
+            first_readbacks = set()
+            
+            for attempt in range(max_retries + 1):
+                try:
+                    # Verify the whole range with one read straight after the writes
+                    if verify:
+                        read_data = reader.write_then_read_blocks(start_block, blocks)
+                        
+                        # One comparison over the whole range; only locate the
+                        # offending block once we know there is a mismatch
+                        if read_data != data:
+                            first_readbacks.add(bytes(read_data[:16]))
+                            bad_block = start_block + _first_mismatched_block(read_data, data)
+                            if logger.isEnabledFor(logging.WARNING):
+                                offset = (bad_block - start_block) * 16
+                                logger.warning("Block %d expected: %s, Got: %s", bad_block,
+                                               data[offset:offset + 16].hex(), read_data[offset:offset + 16].hex())
+                            raise NFCWriteError(f"Data verification failed at block {bad_block} "
+                                                f"(blocks {start_block}-{end_block})")
+                    else:
+                        reader.write_blocks(start_block, blocks)
+                    
+                    logger.info("Successfully wrote data to blocks %d-%d", start_block, end_block)
+                    return True
+                    
+                except NFCNoTagError:
+                    # Re-raise no tag error immediately
+                    logger.warning("No tag present when trying to write")
+                    raise
+                    
+                except (NFCError, OSError) as e:
+                    if attempt >= max_retries:
+                        # Tell a write-protected tag from a failed write
+                        if self._write_was_rejected(start_block, data, first_readbacks):
+                            error_msg = f"Tag appears to be read-only or write-protected: {e}"
+                            logger.warning(error_msg)
+                            raise NFCTagNotWritableError(error_msg)
+                        
+                        error_msg = f"Error writing tag data to blocks {start_block}-{end_block} after {max_retries} retries: {e}"
+                        logger.error(error_msg)
+                        raise NFCWriteError(error_msg)
+                    
+                    logger.warning("Multi-block write failed, retrying (%s/%s): %s", attempt+1, max_retries, e)
+                    time.sleep(_write_retry_delay(attempt))
+
+    def get_hardware_info(self, refresh=False):
+        """
+        Get information about the NFC hardware.
+        
+        The firmware version is cached when the reader connects, so this normally
+        does not touch the bus.
+        
+        Args:
+            refresh (bool): Re-query the firmware version from the chip
+        
+        Returns:
+            dict: Hardware information including model, firmware version
+        """
+        reader = self._reader
+        if not reader:
+            logger.error("NFC controller not initialized")
+            return {
+                "initialized": False,
+                "connected": False,
+                "error": "NFC controller not initialized"
+            }
+        
+        try:
+            # Get firmware version
+            version = reader.get_version(refresh)
+            
+            info = {
+                "initialized": True,
+                "connected": True,
+                "i2c_bus": reader.i2c_bus,
+                "i2c_address": reader.i2c_address_str,
+                "i2c_frequency": reader.i2c_frequency,
+                "firmware_version": version or "Unknown"
+            }
+            
+            return info
+            
+        except Exception as e:
+            logger.error("Error getting hardware info: %s", e)
+            return {
+                "initialized": True,
+                "connected": False,
+                "error": str(e)
+            }
+
+    def authenticate_tag(self, block, key_type='A', key=b'\xFF\xFF\xFF\xFF\xFF\xFF'):
+        """
+        Authenticate with a MIFARE tag before reading/writing protected blocks.
+        
+        Args:
+            block (int): Block number to authenticate
+            key_type (str): Type of key ('A' or 'B')
+            key (bytes): 6-byte authentication key (default is the factory default)
+            
+        Returns:
+            bool: True if authentication successful
+            
+        Raises:
+            NFCAuthenticationError: If authentication fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+        """
+        # Ensure NFC controller is initialized
+        reader = self._get_reader()
+        
+        # Keep the presence check and authentication together on the bus
+        with self._lock.read_lock(), reader.lock:
+            try:
+                # Ensure tag is present
+                if not reader.poll():
+                    raise NFCNoTagError("No NFC tag detected")
+                
+                # Authenticate with tag
+                result = reader.authenticate(block, key_type, key)
+                if result:
+                    logger.info("Successfully authenticated for block %d", block)
+                else:
+                    raise NFCAuthenticationError(f"Authentication failed for block {block}")
+                
+                return result
+                
+            except NFCNoTagError:
+                # Re-raise no tag error
+                raise
+                
+            except NFCAuthenticationError:
+                # Re-raise authentication error
+                raise
+                
+            except Exception as e:
+                logger.error("Authentication error: %s", e)
+                raise NFCAuthenticationError(f"Authentication error: {e}")
+
+    def _read_ndef_data_internal(self, max_blocks=8, retries=2, allow_partial=True):
+        """
+        Internal helper function to read NDEF data from a tag.
+        This is used by poll_for_tag and read_ndef_data.
+        
+        Args:
+            max_blocks (int): Maximum number of blocks to read for NDEF data
+            retries (int): Number of retries for each block read
+            allow_partial (bool): Whether to parse what could be read when some of
+                                  the message blocks are unreadable, instead of raising
+        
+        Returns:
+            dict: Parsed NDEF message and records or None if no valid NDEF data
+            
+        Raises:
+            NFCReadError: If reading fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+        """
+        # Hold the read side across every block read, so a concurrent tag write
+        # cannot leave a torn message (TLV header of one write, body of another).
+        # The nested per-block read locks just re-enter it
+        self._get_reader()
+        with self._lock.read_lock():
+            return self._read_ndef_message(max_blocks, retries, allow_partial)
+
+    def _read_ndef_message(self, max_blocks, retries, allow_partial=True):
+        """
+        Internal helper reading and parsing the NDEF message starting at block 4.
+        
+        The caller holds the read side of the controller lock.
+        
+        Args:
+            max_blocks (int): Maximum number of blocks to read for NDEF data
+            retries (int): Number of retries for each block read
+            allow_partial (bool): Whether to parse what could be read when some of
+                                  the message blocks are unreadable, instead of raising
+        
+        Returns:
+            dict: Parsed NDEF message and records or None if no valid NDEF data
+            
+        Raises:
+            NFCReadError: If reading fails
+            NFCNoTagError: If no tag is present
+        """
+        # Read the first block (usually where NDEF data starts)
+        try:
+            data = self.read_tag_data(4)
+        except NFCReadError:
+            # Retry once if first read fails
+            try:
+                time.sleep(0.1)
+                data = self.read_tag_data(4)
+            except NFCReadError as e:
+                logger.error("Failed to read initial NDEF block: %s", e)
+                raise
+        
+        # Decode TLV type and both possible length encodings in a single read
+        if len(data) >= 4:
+            tlv_type, len_byte, long_length = struct.unpack_from('>BBH', data, 0)
+        else:
+            tlv_type = len_byte = long_length = None
+        
+        # Check for TLV structure to determine NDEF message length
+        if tlv_type == 0x03:  # NDEF Message TLV
+            # Determine TLV length format and message length
+            if len_byte == 0xFF:
+                # 3-byte length format
+                tlv_length = long_length
+                total_bytes_needed = tlv_length + 4  # TLV type + 3-byte length + payload
+            else:
+                # 1-byte length format
+                tlv_length = len_byte
+                total_bytes_needed = tlv_length + 2  # TLV type + length byte + payload
+            
+            # Empty NDEF message (freshly formatted tag), nothing more to read or parse
+            if tlv_length == 0:
+                logger.debug("Empty NDEF message on tag")
+                return None
+            
+            logger.debug("Detected NDEF message with length %s bytes", tlv_length)
+            
+            # If data spans multiple blocks, read additional blocks
+            if total_bytes_needed > 16:
+                # Calculate how many additional blocks we need (up to max_blocks)
+                blocks_needed = min((total_bytes_needed - 16 + 15) // 16, max_blocks - 1)
+                
+                data = self._read_ndef_continuation(data, blocks_needed, retries, allow_partial)
+                logger.debug("Read %s bytes of NDEF data", len(data))
+        
+        # Look for alternative NDEF format where first byte is length
+        elif len(data) > 2 and data[0] > 0 and data[0] < len(data) and data[1] in [0x01, 0x03, 0xD1]:
+            message_length = data[0]
+            logger.debug("Detected alternative NDEF format with length %s bytes", message_length)
+            
+            # If data spans multiple blocks, read additional blocks
+            if message_length + 1 > 16:
+                blocks_needed = min((message_length + 1 - 16 + 15) // 16, max_blocks - 1)
+                
+                data = self._read_ndef_continuation(data, blocks_needed, 0, allow_partial)
+        
+        # Parse NDEF data
+        ndef_data = parse_ndef_data(data)
+        if not ndef_data:
+            logger.debug("No valid NDEF data found on tag")
+            return None
+            
+        return ndef_data
 
-def initialize(i2c_bus=1, i2c_address=0x24, retries=3):
-    """
-    Initialize the NFC controller and hardware.
-    
-    Args:
-        i2c_bus (int): I2C bus number (usually 1 on Raspberry Pi)
-        i2c_address (int): I2C device address of the NFC HAT
-        retries (int): Number of connection retries before failing
-    
-    Returns:
-        bool: True if initialization successful, False otherwise
-    """
-    global _nfc_reader, _initialized
-    
-    with _reader_lock:
-        # Return early if already initialized
-        if _initialized and _nfc_reader is not None:
-            logger.debug("NFC controller already initialized")
-            return True
+    def _read_ndef_continuation(self, first_block, blocks_needed, retries, allow_partial=True):
+        """
+        Internal helper to read the NDEF blocks that follow block 4.
+        
+        The whole range is fetched with one multi-block read. Only if that fails are
+        the blocks read one at a time, so that a partially readable message can
+        still be returned.
+        
+        Args:
+            first_block (bytes): Data already read from block 4
+            blocks_needed (int): Number of blocks to read after block 4
+            retries (int): Number of retries for each block read
+            allow_partial (bool): Whether to return the blocks read so far when a
+                                  block is unreadable, instead of raising
+            
+        Returns:
+            bytes: Block 4 followed by as many further blocks as could be read
+            
+        Raises:
+            NFCReadError: If a block is unreadable and allow_partial is False
+            NFCNoTagError: If no tag is present
+        """
+        try:
+            return first_block + self.read_tag_blocks(5, blocks_needed, retries)
+        except NFCReadError as e:
+            logger.debug("Multi-block NDEF read failed, reading blocks individually: %s", e)
+        
+        # Read every block straight into one preallocated buffer
+        buf = bytearray((blocks_needed + 1) * 16)
+        buf[:16] = first_block
+        filled = 16
+        
+        # Read additional blocks into successive 16-byte windows
+        for i in range(1, blocks_needed + 1):
+            block_num = 4 + i
+            for attempt in range(retries + 1):
+                try:
+                    self._read_tag_data_into(block_num, buf, i * 16, 0)
+                    filled += 16
+                    break
+                except NFCReadError as e:
+                    if attempt < retries:
+                        logger.debug("Retrying read of NDEF block %s", block_num)
+                        time.sleep(0.1)
+                        continue
+                    logger.warning("Could not read additional NDEF block %s: %s", block_num, e)
+                    if not allow_partial:
+                        raise
+            if filled < (i + 1) * 16:
+                # We'll process what we have so far
+                break
+        
+        return bytes(memoryview(buf)[:filled])
+
+    def _read_block_or_none(self, block):
+        """
+        Internal helper reading one block without retries, for write failure diagnosis.
+        
+        Args:
+            block (int): Block number to read
+        
+        Returns:
+            bytes or None: Block data, or None if the block could not be read
+        """
+        try:
+            return self.read_tag_data(block, retries=0)
+        except NFCError as e:
+            logger.debug("Could not read block %s: %s", block, e)
+            return None
+
+    def _tag_is_locked(self):
+        """
+        Internal helper to check the lock bytes and capability container of a Type 2 tag.
+        
+        Block 0 holds pages 0-3: the static lock bytes at the end of page 2 and the
+        capability container (CC) in page 3. A tag made read-only has its CC write
+        access nibble set, and typically all static lock bits set as well.
+        
+        Returns:
+            bool: True if the tag reports itself locked, False otherwise (including
+                  tags without an NDEF capability container)
+        """
+        data = self._read_block_or_none(0)
+        # CC magic number 0xE1 marks an NDEF formatted Type 2 tag; anything else
+        # (e.g. the MIFARE Classic manufacturer block) carries no lock information
+        if not data or len(data) < 16 or data[12] != 0xE1:
+            return False
+        return (data[15] & 0x0F) != 0 or data[10:12] == b'\xff\xff'
+
+    def _write_was_rejected(self, block, expected, readbacks=()):
+        """
+        Internal helper to tell a write-protected tag from a failed write.
+        
+        Only called once all write attempts have failed, so a successful write
+        pays no extra reads. NTAG pages are written atomically, so a write that
+        reached the tag leaves at least one 4-byte page of the block holding the
+        new data. The tag is taken to be read-only if a single read of the block
+        shows none of the written pages, or if its lock bytes or CC access byte
+        say it is locked. A half-written block is an ordinary write failure, as is
+        one whose verify read-backs changed between attempts: its content is
+        moving, so the tag is taking writes.
+        
+        Args:
+            block (int): First block that was written
+            expected (bytes): Data that was supposed to be written to that block
+            readbacks (set, optional): Distinct contents of the block read back by
+                                       the failed verify attempts
+        
+        Returns:
+            bool: True if the tag appears to be write-protected, False otherwise
+        """
+        expected = expected[:16].ljust(16, b'\x00')
+        data = self._read_block_or_none(block)
+        if data is not None and len(data) >= 16 and len(readbacks) <= 1:
+            if all(data[i:i + 4] != expected[i:i + 4] for i in range(0, 16, 4)):
+                return True
+        return self._tag_is_locked()
+
+    def read_ndef_data(self, retries=2):
+        """
+        Read and parse NDEF formatted data from tag.
+        
+        Args:
+            retries (int): Number of read retries if failures occur
+        
+        Returns:
+            dict: Parsed NDEF message and records or None if no valid NDEF data
             
-        _initialized = False
+        Raises:
+            NFCReadError: If reading fails
+            NFCNoTagError: If no tag is present
+            NFCHardwareError: If hardware not initialized
+        """
+        # Ensure NFC controller is initialized
+        try:
+            self._ensure_initialized()
+        except NFCHardwareError as e:
+            if not self._reinitialize_if_needed():
+                raise e
         
-        # Try initialization with retries
-        for attempt in range(retries):
+        # Attempt to read NDEF data with retries
+        for attempt in range(retries + 1):
             try:
-                # Clean up previous instance if it exists
-                if _nfc_reader is not None:
-                    try:
-                        _nfc_reader.disconnect()
-                    except Exception as e:
-                        logger.debug(f"Error disconnecting previous reader: {e}")
+                ndef_data = self._read_ndef_data_internal()
+                
+                if ndef_data:
+                    return ndef_data
+                
+                if attempt < retries:
+                    logger.debug("No valid NDEF data found (attempt %s), retrying...", attempt+1)
+                    time.sleep(0.1)
+                    continue
+                
+                logger.warning("No valid NDEF data found on tag after all attempts")
+                return None
+                
+            except NFCNoTagError:
+                # No point in retrying if tag isn't present
+                raise
                 
-                # Create new reader instance
-                _nfc_reader = NFCReader(i2c_bus, i2c_address)
+            except Exception as e:
+                if attempt < retries:
+                    logger.debug("NDEF read attempt %s failed: %s, retrying...", attempt+1, e)
+                    time.sleep(0.1)
+                    continue
                 
-                # Connect to hardware
-                if not _nfc_reader.connect():
-                    logger.error(f"Failed to connect to NFC hardware (attempt {attempt+1}/{retries})")
-                    time.sleep(0.5)  # Brief delay before retry
+                error_msg = f"Error reading NDEF data after {retries+1} attempts: {e}"
+                logger.error(error_msg)
+                raise NFCReadError(error_msg)
+
+    def write_ndef_uri(self, uri, retries=2):
+        """
+        Write a URI record to an NFC tag. Specialized for URLs like YouTube or Music links.
+        
+        Args:
+            uri (str): The URI to write (e.g., 'https://youtube.com/watch?v=...')
+            retries (int): Number of write retries if failures occur
+            
+        Returns:
+            bool: True if successful
+            
+        Raises:
+            NFCWriteError: If writing fails
+            NFCNoTagError: If no tag is present
+            NFCTagNotWritableError: If tag is read-only or incorrectly formatted
+            NFCHardwareError: If hardware not initialized
+            ValueError: If the URI is empty or not an http:// or https:// URL
+        """
+        if not uri:
+            raise ValueError("URI cannot be empty")
+            
+        # Reject malformed URIs before spending a write/verify cycle on them
+        if not _URI_RE.match(uri):
+            raise ValueError(f"URI must start with http:// or https://: {uri}")
+        
+        # Use the general NDEF writing function but specify only the URL
+        for attempt in range(retries + 1):
+            try:
+                return self.write_ndef_data(url=uri)
+            except (NFCNoTagError, NFCTagNotWritableError):
+                # No point in retrying these errors
+                raise
+            except Exception as e:
+                if attempt < retries:
+                    logger.debug("NDEF URI write attempt %s failed: %s, retrying...", attempt+1, e)
+                    time.sleep(0.2)
                     continue
                 
-                # Reset hardware to ensure clean state
-                _nfc_reader.reset()
+                error_msg = f"Error writing URI to tag after {retries+1} attempts: {e}"
+                logger.error(error_msg)
+                raise NFCWriteError(error_msg)
+
+    def write_ndef_data(self, url=None, text=None, retries=2, verify=True):
+        """
+        Write NDEF formatted data to tag.
+        
+        Args:
+            url (str, optional): URL to encode
+            text (str, optional): Text to encode
+            retries (int): Number of write retries if failures occur
+            verify (bool): Whether to verify the NDEF data after writing
+            
+        Returns:
+            bool: True if successful
+            
+        Raises:
+            NFCWriteError: If writing fails
+            NFCNoTagError: If no tag is present
+            NFCTagNotWritableError: If tag is read-only or incorrectly formatted
+            NFCHardwareError: If hardware not initialized
+        """
+        if not url and not text:
+            raise ValueError("Either url or text must be provided")
+        
+        # Ensure NFC controller is initialized
+        try:
+            self._ensure_initialized()
+        except NFCHardwareError as e:
+            if not self._reinitialize_if_needed():
+                raise e
+        
+        # Create NDEF formatted data
+        try:
+            ndef_data = create_ndef_data(url=url, text=text)
+        except Exception as e:
+            error_msg = f"Error creating NDEF data: {e}"
+            logger.error(error_msg)
+            raise NFCWriteError(error_msg)
+        
+        # Ensure tag is present before attempting to write (UID only, no NDEF read)
+        if not self._poll_uid_only():
+            raise NFCNoTagError("No NFC tag detected")
+        
+        # Write data to tag (NDEF data typically starts at block 4)
+        # All blocks are written back-to-back and, when verify is set, checked
+        # byte-for-byte with one read of the whole range at the end. That is a
+        # stricter check than re-parsing the NDEF message, so no second
+        # read-back pass is made here
+        for attempt in range(retries + 1):
+            try:
+                # Rather than probing with a test write up front, write_tag_blocks()
+                # classifies a failed write and raises NFCTagNotWritableError
+                # for a write-protected tag
+                if not self.write_tag_blocks(ndef_data, 4, verify=verify):
+                    raise NFCWriteError("Failed to write NDEF data blocks")
                 
-                _initialized = True
-                logger.info(f"NFC controller initialized successfully on bus {i2c_bus}, address 0x{i2c_address:02X}")
+                logger.info("Successfully wrote NDEF data to tag")
                 return True
                 
+            except NFCNoTagError:
+                # No point in retrying if tag isn't present
+                raise
+                
+            except NFCTagNotWritableError:
+                # No point in retrying if tag is read-only
+                raise
+                
             except Exception as e:
-                logger.error(f"Error during NFC initialization (attempt {attempt+1}/{retries}): {e}")
-                if _nfc_reader:
-                    try:
-                        _nfc_reader.disconnect()
-                    except Exception:
-                        pass
-                    _nfc_reader = None
+                if attempt < retries:
+                    logger.debug("NDEF write attempt %s failed: %s, retrying...", attempt+1, e)
+                    time.sleep(0.2)
+                    continue
                 
-                # Wait before retrying, increasing delay with each attempt
-                time.sleep(0.5 * (attempt + 1))
+                error_msg = f"Error writing NDEF data after {retries+1} attempts: {e}"
+                logger.error(error_msg)
+                raise NFCWriteError(error_msg)
+
+    def _wait_for_tag_irq(self, timeout, exit_event=None):
+        """
+        Internal helper to sleep until the PN532 IRQ signals a tag, or the timeout expires.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            exit_event (threading.Event, optional): Ends the wait early once set; it is
+                                                    checked every _IRQ_EXIT_CHECK seconds
+            
+        Returns:
+            bytes, bool or None: Raw UID of the tag that fired the IRQ, False on timeout
+                                 (or a wake-up without a readable tag), or None if IRQ is
+                                 not available and the caller should fall back to a timed wait
+        """
+        reader = self._reader
+        if reader is None or not reader.irq_enabled:
+            return None
+        with self._lock.read_lock():
+            reader.listen_for_tag()
+        
+        # Wait without holding the bus so other operations can use the reader
+        if exit_event is None:
+            woke = reader.wait_for_irq(timeout)
+        else:
+            # Wait in short slices on the same armed detection, so a stop request
+            # is noticed quickly without re-arming the PN532 each time
+            woke = False
+            deadline = time.monotonic() + timeout
+            while not woke and not exit_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                woke = reader.wait_for_irq(min(remaining, _IRQ_EXIT_CHECK))
+        if not woke:
+            return False
         
-        # If we get here, all retries failed
-        _nfc_reader = None
-        logger.error(f"NFC initialization failed after {retries} attempts")
-        return False
+        # Collect the target the armed detection found instead of polling again
+        with self._lock.read_lock():
+            return reader.read_detected_tag() or False
+
+    def continuous_poll(self, callback, interval=0.1, exit_event=None, read_ndef=False, deduplicate=True,
+                        max_interval=1.0, use_irq=True, backoff=1.5, min_interval=0.02,
+                        on_remove=None, miss_threshold=3):
+        """
+        Continuously poll for NFC tags and call the callback function when detected.
+        
+        Args:
+            callback (function): Function to call when tag is detected.
+                                 If read_ndef is False: Called with UID string parameter
+                                 If read_ndef is True: Called with (UID string, NDEF data) tuple
+            interval (float): Polling interval in seconds
+            exit_event (threading.Event, optional): Event to signal when to stop polling.
+                                                    Defaults to a shared module event that
+                                                    stop_continuous_poll() sets.
+            read_ndef (bool): Whether to read NDEF data from detected tags
+            deduplicate (bool): Only trigger callback when a new tag is detected (not on every poll)
+            max_interval (float): Upper bound for the polling interval while no tag is present.
+                                  The interval grows by `backoff` on each empty poll up to
+                                  this cap and resets to `interval` as soon as a tag is detected.
+            use_irq (bool): Sleep on the PN532 IRQ line while no tag is present, if an
+                            IRQ pin was passed to initialize(). Set to False to force the
+                            timed polling fallback.
+            backoff (float): Factor the idle polling interval grows by after each empty poll
+            min_interval (float): Delay before the first re-poll after a new tag is detected,
+                                  so a tag that is only briefly presented is seen leaving
+                                  (or being swapped) without waiting a full interval
+            on_remove (function, optional): Called with the UID string once a detected tag
+                                            has left the reader
+            miss_threshold (int): Consecutive empty polls before a detected tag counts as
+                                  removed. Debounces RF dropouts: until then the tag is
+                                  neither reported as removed nor re-reported on its return.
+            
+        Note:
+            This function runs in a loop and is typically called in a separate thread.
+            The callback runs on its own consumer thread, fed through a lock-free
+            ring buffer, so a slow callback does not delay the next poll.
+            Stop polling by setting exit_event (e.g. from a SIGINT handler); every
+            wait in the loop returns as soon as it is set.
+        """
+        last_raw_uid = None
+        present_uid = None
+        miss_count = 0
+        miss_threshold = max(miss_threshold, 1)
+        consecutive_errors = 0
+        current_interval = interval
+        max_interval = max(max_interval, interval)
+        min_interval = min(min_interval, interval)
+        backoff = max(backoff, 1.0)
+        
+        # Fall back to the shared exit event if one wasn't provided. It is only
+        # cleared once the last loop using it has exited, so a stop requested
+        # before a loop gets going is not lost
+        if exit_event is None:
+            exit_event = self._exit_event
+        
+        logger.info("Starting continuous polling with interval %ss, read_ndef=%s", interval, read_ndef)
+        
+        # Hand detected tags to a consumer thread so callback latency never stalls polling
+        events = _SPSCRing()
+        poll_done = threading.Event()
+        consumer = threading.Thread(
+            target=_dispatch_tag_events,
+            args=(events, callback, read_ndef, poll_done, on_remove),
+            name="nfc-tag-callback",
+            daemon=True
+        )
+        consumer.start()
+        
+        if exit_event is self._exit_event:
+            with self._exit_users_lock:
+                self._exit_users += 1
+        
+        try:
+            # Ensure NFC controller is initialized before starting
+            if not self.initialized or self._reader is None:
+                if not self._reinitialize_if_needed():
+                    logger.error("Could not initialize NFC controller for continuous polling")
+                    return
+            
+            # Bind hot-loop callables to locals to avoid global lookups per iteration
+            _poll = self.poll_for_tag_raw
+            _wait = exit_event.wait
+            
+            while not exit_event.is_set():
+                try:
+                    # Poll for the raw UID; formatting and NDEF reads only happen
+                    # when a new tag shows up
+                    raw_uid = _poll()
+                    
+                    # Reset error counter on successful poll
+                    consecutive_errors = 0
+                    
+                    # If no tag detected
+                    if not raw_uid:
+                        # A detected tag only counts as gone after miss_threshold
+                        # empty polls in a row; keep polling on the timer until then
+                        if present_uid is not None:
+                            miss_count += 1
+                            if miss_count < miss_threshold:
+                                if _wait(interval):
+                                    break
+                                continue
+                            
+                            _queue_tag_removal(events, present_uid, on_remove)
+                            present_uid = None
+                            miss_count = 0
+                            current_interval = interval
+                        
+                        # Clear last UID if we're deduplicating
+                        if deduplicate:
+                            last_raw_uid = None
+                        
+                        # Sleep until a tag wakes the IRQ line; the wake-up carries the
+                        # tag's UID, so it is handled without another poll. Each wait
+                        # is capped so exit_event is still checked regularly; on
+                        # timeout the PN532 is simply re-armed.
+                        if use_irq:
+                            woke = self._wait_for_tag_irq(max_interval, exit_event)
+                            while woke is False and not exit_event.is_set():
+                                woke = self._wait_for_tag_irq(max_interval, exit_event)
+                            if woke is False:
+                                break
+                            raw_uid = woke
+                        
+                        if not raw_uid:
+                            # Back off while idle; wait() returns True as soon as exit_event is set
+                            current_interval = min(current_interval * backoff, max_interval)
+                            if _wait(current_interval):
+                                break
+                            continue
+                    
+                    # Tag is present, return to the fast polling rate
+                    miss_count = 0
+                    current_interval = interval
+                    
+                    # Re-check quickly once after a new tag shows up
+                    is_new_tag = raw_uid != last_raw_uid
+                    next_wait = min_interval if is_new_tag else current_interval
+                    
+                    # Check if this is a new tag or we're not deduplicating
+                    if not deduplicate or is_new_tag:
+                        uid = self._format_uid_cached(raw_uid)
+                        ndef_data = self._read_ndef_for_uid(uid) if read_ndef else None
+                        
+                        # A different tag replaced the previous one without a gap
+                        if present_uid is not None and present_uid != uid:
+                            _queue_tag_removal(events, present_uid, on_remove)
+                            present_uid = None
+                        
+                        # Queue the event for the callback thread
+                        if events.put((uid, ndef_data)):
+                            # Update last seen UID
+                            last_raw_uid = raw_uid
+                            present_uid = uid
+                        else:
+                            logger.warning("Tag event queue full, dropping detection of %s", uid)
+                    
+                    # Wait for next poll
+                    if _wait(next_wait):
+                        break
+                    
+                except Exception as e:
+                    consecutive_errors += 1
+                    logger.error("Error during continuous polling: %s", e)
+                    
+                    # If we have too many consecutive errors, try to reinitialize
+                    if consecutive_errors >= 5:
+                        logger.warning("Too many consecutive errors, attempting to reinitialize NFC controller")
+                        try:
+                            self.shutdown()
+                            if _wait(0.5):
+                                break
+                            # Same bus, clock rate and IRQ pin as the original setup
+                            if not self.initialize(**self._init_args):
+                                logger.error("Failed to reinitialize NFC controller, stopping continuous poll")
+                                return
+                            consecutive_errors = 0
+                        except Exception as reinit_e:
+                            logger.error("Error reinitializing NFC controller: %s", reinit_e)
+                            return
+                    
+                    # Don't exit the loop, try again after a short delay
+                    if _wait(interval):
+                        break
+                    
+        finally:
+            # Let the consumer deliver anything still queued, then stop it
+            poll_done.set()
+            events.ready.set()
+            consumer.join(timeout=5.0)
+            # Re-arm the shared event for the next loop
+            if exit_event is self._exit_event:
+                with self._exit_users_lock:
+                    self._exit_users -= 1
+                    if not self._exit_users:
+                        exit_event.clear()
+            logger.info("Continuous polling stopped")
+
+    def stop_continuous_poll(self):
+        """
+        Stop a continuous_poll() loop that was started without its own exit_event.
+        """
+        self._exit_event.set()
+
+# Module-level controller instance
+_controller = NFCController()
+
+def is_initialized():
+    """
+    Check whether the NFC controller has a connected reader.
+    
+    Returns:
+        bool: True if initialize() succeeded and shutdown() has not been called since
+    """
+    return _controller.initialized
+
+def initialize(i2c_bus=1, i2c_address=0x24, retries=3, i2c_frequency=400_000, irq_pin=None):
+    """
+    Initialize the NFC controller and hardware.
+    
+    Args:
+        i2c_bus (int): I2C bus number (usually 1 on Raspberry Pi)
+        i2c_address (int): I2C device address of the NFC HAT
+        retries (int): Number of connection retries before failing
+        i2c_frequency (int): I2C clock rate in Hz (default 400 kHz Fast-mode)
+        irq_pin (int, optional): GPIO (BCM) wired to the PN532 IRQ line. When set,
+                                 continuous_poll() sleeps until the IRQ fires instead of
+                                 polling on a timer.
+    
+    Returns:
+        bool: True if initialization successful, False otherwise
+    """
+
+    return _controller.initialize(i2c_bus, i2c_address, retries, i2c_frequency, irq_pin)
 
 def shutdown():
     """
@@ -95,56 +1708,40 @@ def shutdown():
     Returns:
         bool: True if shutdown successful, False if errors occurred
     """
-    global _nfc_reader, _initialized
-    
-    with _reader_lock:
-        if not _nfc_reader:
-            logger.debug("NFC controller already shut down or not initialized")
-            _initialized = False
-            return True
-        
-        try:
-            _nfc_reader.disconnect()
-            logger.info("NFC controller shut down successfully")
-            _initialized = False
-            return True
-        except Exception as e:
-            logger.error(f"Error during NFC shutdown: {e}")
-            return False
-        finally:
-            _nfc_reader = None
 
-def _ensure_initialized():
+    return _controller.shutdown()
+
+def get_reader():
     """
-    Internal helper to ensure NFC controller is initialized before operations.
+    Get the reader opened by initialize(), for direct hardware access.
+    
+    The reader stays owned by the controller: it is closed by shutdown() and
+    must not be disconnected by the caller.
     
+    Returns:
+        NFCReader: The active reader
+        
     Raises:
-        NFCHardwareError: If NFC controller is not initialized
+        NFCHardwareError: If NFC controller is not initialized and cannot be
     """
-    global _nfc_reader, _initialized
-    
-    if not _initialized or _nfc_reader is None:
-        error_msg = "NFC controller not initialized"
-        logger.error(error_msg)
-        raise NFCHardwareError(error_msg)
 
-def _reinitialize_if_needed():
+    return _controller.get_reader()
+
+def poll_for_tag_raw(retries=2):
     """
-    Internal helper to attempt re-initialization if connection seems broken.
+    Check for presence of an NFC tag and return its raw UID.
     
-    Returns:
-        bool: True if reinitialization successful or not needed, False otherwise
-    """
-    global _nfc_reader, _initialized
+    Cheaper than poll_for_tag() when the UID is only compared, e.g. to notice
+    that a different tag was placed on the reader.
     
-    if not _initialized or _nfc_reader is None:
-        logger.warning("Attempting to reinitialize NFC controller")
-        # Use default parameters if we don't have the original ones
-        i2c_bus = getattr(_nfc_reader, 'i2c_bus', 1) if _nfc_reader else 1
-        i2c_address = getattr(_nfc_reader, 'i2c_address', 0x24) if _nfc_reader else 0x24
-        return initialize(i2c_bus, i2c_address)
+    Args:
+        retries (int): Number of retries if initial poll fails
     
-    return True
+    Returns:
+        bytes or None: Raw tag UID if tag found, None otherwise
+    """
+
+    return _controller.poll_for_tag_raw(retries)
 
 def poll_for_tag(read_ndef=False, timeout=0.1, retries=2):
     """
@@ -161,118 +1758,83 @@ def poll_for_tag(read_ndef=False, timeout=0.1, retries=2):
             - If read_ndef=True but no NDEF data: (uid_str, None)
             - If read_ndef=False: uid_str if tag found, None otherwise
     """
-    global _nfc_reader
+
+    return _controller.poll_for_tag(read_ndef, timeout, retries)
+
+def read_tag_data(block=4, retries=3):
+    """
+    Read data from a specific block on the currently present tag.
     
-    with _reader_lock:
-        # Ensure NFC controller is initialized
-        try:
-            _ensure_initialized()
-        except NFCHardwareError:
-            if not _reinitialize_if_needed():
-                return None
-        
-        # Multiple attempts to improve reliability
-        for attempt in range(retries + 1):
-            try:
-                # Poll for tag
-                raw_uid = _nfc_reader.poll()
-                
-                # Return None if no tag found
-                if not raw_uid:
-                    if attempt < retries:
-                        time.sleep(0.05)  # Short delay before retry
-                        continue
-                    return None
-                
-                # Format UID
-                uid = format_uid(raw_uid)
-                logger.debug(f"NFC tag detected: {uid}")
-                
-                # If we don't need to read NDEF data, just return the UID
-                if not read_ndef:
-                    return uid
-                
-                # Attempt to read NDEF data from the tag
-                ndef_data = None
-                try:
-                    ndef_data = _read_ndef_data_internal()
-                    if ndef_data:
-                        logger.debug(f"Read NDEF data during polling: {len(ndef_data.get('records', []))} records")
-                except Exception as e:
-                    logger.debug(f"Unable to read NDEF data during polling: {e}")
-                
-                # Return tuple of UID and NDEF data (which may be None)
-                return (uid, ndef_data)
-                
-            except Exception as e:
-                if attempt < retries:
-                    logger.debug(f"Poll attempt {attempt+1} failed: {e}, retrying...")
-                    time.sleep(0.05)  # Short delay before retry
-                    continue
-                else:
-                    logger.error(f"Error polling for NFC tag after {retries+1} attempts: {e}")
-                    return None
+    Args:
+        block (int): Block number to read from
+        retries (int): Number of read retries if failures occur
+    
+    Returns:
+        bytes: Data read from the tag
+    
+    Raises:
+        NFCReadError: If reading fails
+        NFCNoTagError: If no tag is present
+        NFCHardwareError: If hardware not initialized
+    """
+
+    return _controller.read_tag_data(block, retries)
+
+def write_tag_data(data, block=4, verify=True, max_retries=3):
+    """
+    Write data to a specific block on the currently present tag.
+    
+    Args:
+        data (bytes or str): Data to write (must be 16 bytes or less)
+        block (int): Block number to write to
+        verify (bool): Whether to verify the data was written correctly
+        max_retries (int): Maximum number of retry attempts if verification fails
+    
+    Returns:
+        bool: True if write successful
+    
+    Raises:
+        NFCWriteError: If writing fails
+        NFCNoTagError: If no tag is present
+        NFCHardwareError: If hardware not initialized
+        NFCTagNotWritableError: If tag is read-only
+    """
 
-def read_tag_data(block=4, retries=3):
+    return _controller.write_tag_data(data, block, verify, max_retries)
+
+def read_tag_blocks(start_block=4, count=1, retries=3):
     """
-    Read data from a specific block on the currently present tag.
+    Read several consecutive blocks from the currently present tag.
     
     Args:
-        block (int): Block number to read from
+        start_block (int): First block number to read
+        count (int): Number of blocks to read
         retries (int): Number of read retries if failures occur
     
     Returns:
-        bytes: Data read from the tag
+        bytes: Concatenated block data (count * 16 bytes)
     
     Raises:
         NFCReadError: If reading fails
         NFCNoTagError: If no tag is present
         NFCHardwareError: If hardware not initialized
     """
-    global _nfc_reader
-    
-    with _reader_lock:
-        # Ensure NFC controller is initialized
-        try:
-            _ensure_initialized()
-        except NFCHardwareError as e:
-            if not _reinitialize_if_needed():
-                raise e
-        
-        for attempt in range(retries + 1):
-            try:
-                # Read block data
-                data = _nfc_reader.read_block(block)
-                if data and len(data) == 16:
-                    logger.debug(f"Data read from block {block}: {data.hex()}")
-                    return data
-                else:
-                    raise NFCReadError(f"Invalid data length from block {block}: {len(data) if data else 0} bytes")
-                
-            except NFCNoTagError:
-                # No point retrying if tag isn't present
-                logger.warning("No tag present when trying to read")
-                raise
-                
-            except Exception as e:
-                if attempt < retries:
-                    logger.debug(f"Read attempt {attempt+1} failed: {e}, retrying...")
-                    time.sleep(0.1)  # Slightly longer delay for read retries
-                    continue
-                else:
-                    error_msg = f"Error reading tag data from block {block} after {retries+1} attempts: {e}"
-                    logger.error(error_msg)
-                    raise NFCReadError(error_msg)
 
-def write_tag_data(data, block=4, verify=True, max_retries=3):
+    return _controller.read_tag_blocks(start_block, count, retries)
+
+def write_tag_blocks(data, start_block=4, verify=True, max_retries=3):
     """
-    Write data to a specific block on the currently present tag.
+    Write data spanning several consecutive blocks on the currently present tag.
+    
+    All blocks are written back-to-back and then verified with a single read of
+    the whole range, instead of a write/wait/read cycle per block. On a
+    verification mismatch the entire range is rewritten.
     
     Args:
-        data (bytes or str): Data to write (must be 16 bytes or less)
-        block (int): Block number to write to
+        data (bytes or str): Data to write, zero-padded to a multiple of 16 bytes
+        start_block (int): First block number to write to
         verify (bool): Whether to verify the data was written correctly
-        max_retries (int): Maximum number of retry attempts if verification fails
+        max_retries (int): Maximum number of retry attempts if writing or verification fails
     
     Returns:
         bool: True if write successful
@@ -283,131 +1845,24 @@ def write_tag_data(data, block=4, verify=True, max_retries=3):
         NFCHardwareError: If hardware not initialized
         NFCTagNotWritableError: If tag is read-only
     """
-    global _nfc_reader
-    
-    with _reader_lock:
-        # Ensure NFC controller is initialized
-        try:
-            _ensure_initialized()
-        except NFCHardwareError as e:
-            if not _reinitialize_if_needed():
-                raise e
-        
-        # Ensure data is bytes
-        if isinstance(data, str):
-            data = data.encode('utf-8')
-        
-        # Validate data length
-        if len(data) > 16:
-            error_msg = f"Data too long ({len(data)} bytes). Maximum is 16 bytes per block."
-            logger.error(error_msg)
-            raise NFCWriteError(error_msg)
-        
-        # Pad data to 16 bytes if needed
-        if len(data) < 16:
-            data = data.ljust(16, b'\x00')
-        
-        # Try to poll for tag first to ensure it's present
-        if not _nfc_reader.poll():
-            raise NFCNoTagError("No NFC tag detected")
-        
-        # Write with retries
-        retry_count = 0
-        while retry_count <= max_retries:
-            try:
-                # Write data to tag
-                success = _nfc_reader.write_block(block, data)
-                
-                if not success:
-                    raise NFCWriteError(f"Failed to write data to block {block}")
-                
-                # If verification is requested, read back the data and compare
-                if verify:
-                    # Brief delay to ensure write is complete
-                    time.sleep(0.1)
-                    
-                    # Read back the data
-                    read_data = _nfc_reader.read_block(block)
-                    
-                    # Compare the data
-                    if read_data != data:
-                        logger.warning(f"Verification failed for block {block}. Retry {retry_count+1}/{max_retries}")
-                        logger.warning(f"Expected: {data.hex()}, Got: {read_data.hex()}")
-                        
-                        if retry_count >= max_retries:
-                            error_msg = f"Data verification failed after {max_retries} attempts"
-                            logger.error(error_msg)
-                            raise NFCWriteError(error_msg)
-                        
-                        retry_count += 1
-                        time.sleep(0.2 * (retry_count + 1))  # Increasing delay with each retry
-                        continue
-                
-                logger.info(f"Successfully wrote data to block {block}")
-                return True
-                    
-            except NFCNoTagError:
-                # Re-raise no tag error immediately
-                logger.warning("No tag present when trying to write")
-                raise
-                
-            except NFCTagNotWritableError:
-                # Re-raise if tag is read-only
-                logger.warning("Tag appears to be read-only")
-                raise
-                
-            except Exception as e:
-                if retry_count >= max_retries:
-                    error_msg = f"Error writing tag data to block {block} after {max_retries} attempts: {e}"
-                    logger.error(error_msg)
-                    raise NFCWriteError(error_msg)
-                
-                logger.warning(f"Write error, retrying ({retry_count+1}/{max_retries}): {e}")
-                retry_count += 1
-                time.sleep(0.2 * retry_count)  # Increasing delay with each retry
-        
-        # If we exit the loop without returning, we've exhausted all retries
-        raise NFCWriteError(f"Failed to write data to block {block} after {max_retries} attempts")
 
-def get_hardware_info():
+    return _controller.write_tag_blocks(data, start_block, verify, max_retries)
+
+def get_hardware_info(refresh=False):
     """
     Get information about the NFC hardware.
     
+    The firmware version is cached when the reader connects, so this normally
+    does not touch the bus.
+    
+    Args:
+        refresh (bool): Re-query the firmware version from the chip
+    
     Returns:
         dict: Hardware information including model, firmware version
     """
-    global _nfc_reader
-    
-    with _reader_lock:
-        if not _nfc_reader:
-            logger.error("NFC controller not initialized")
-            return {
-                "initialized": False,
-                "connected": False,
-                "error": "NFC controller not initialized"
-            }
-        
-        try:
-            # Get firmware version
-            version = _nfc_reader.get_version()
-            
-            info = {
-                "initialized": True,
-                "connected": True,
-                "i2c_bus": _nfc_reader.i2c_bus,
-                "i2c_address": f"0x{_nfc_reader.i2c_address:02X}",
-                "firmware_version": version or "Unknown"
-            }
-            
-            return info
-            
-        except Exception as e:
-            logger.error(f"Error getting hardware info: {e}")
-            return {
-                "initialized": True,
-                "connected": False,
-                "error": str(e)
-            }
+
+    return _controller.get_hardware_info(refresh)
 
 def authenticate_tag(block, key_type='A', key=b'\xFF\xFF\xFF\xFF\xFF\xFF'):
     """
@@ -426,134 +1881,8 @@ def authenticate_tag(block, key_type='A', key=b'\xFF\xFF\xFF\xFF\xFF\xFF'):
         NFCNoTagError: If no tag is present
         NFCHardwareError: If hardware not initialized
     """
-    global _nfc_reader
-    
-    with _reader_lock:
-        # Ensure NFC controller is initialized
-        try:
-            _ensure_initialized()
-        except NFCHardwareError as e:
-            if not _reinitialize_if_needed():
-                raise e
-        
-        try:
-            # Ensure tag is present
-            if not _nfc_reader.poll():
-                raise NFCNoTagError("No NFC tag detected")
-            
-            # Authenticate with tag
-            result = _nfc_reader.authenticate(block, key_type, key)
-            if result:
-                logger.info(f"Successfully authenticated for block {block}")
-            else:
-                raise NFCAuthenticationError(f"Authentication failed for block {block}")
-            
-            return result
-            
-        except NFCNoTagError:
-            # Re-raise no tag error
-            raise
-            
-        except NFCAuthenticationError:
-            # Re-raise authentication error
-            raise
-            
-        except Exception as e:
-            logger.error(f"Authentication error: {e}")
-            raise NFCAuthenticationError(f"Authentication error: {e}")
 
-def _read_ndef_data_internal(max_blocks=8, retries=2):
-    """
-    Internal helper function to read NDEF data from a tag.
-    This is used by poll_for_tag and read_ndef_data.
-    
-    Args:
-        max_blocks (int): Maximum number of blocks to read for NDEF data
-        retries (int): Number of retries for each block read
-    
-    Returns:
-        dict: Parsed NDEF message and records or None if no valid NDEF data
-        
-    Raises:
-        NFCReadError: If reading fails
-        NFCNoTagError: If no tag is present
-    """
-    # Read the first block (usually where NDEF data starts)
-    try:
-        data = read_tag_data(4)
-    except NFCReadError:
-        # Retry once if first read fails
-        try:
-            time.sleep(0.1)
-            data = read_tag_data(4)
-        except Exception as e:
-            logger.error(f"Failed to read initial NDEF block: {e}")
-            return None
-    
-    # Check for TLV structure to determine NDEF message length
-    if len(data) >= 2 and data[0] == 0x03:  # NDEF Message TLV
-        # Determine TLV length format and message length
-        if data[1] == 0xFF and len(data) >= 4:
-            # 3-byte length format
-            tlv_length = int.from_bytes(data[2:4], byteorder='big')
-            total_bytes_needed = tlv_length + 4  # TLV type + 3-byte length + payload
-        else:
-            # 1-byte length format
-            tlv_length = data[1]
-            total_bytes_needed = tlv_length + 2  # TLV type + length byte + payload
-        
-        logger.debug(f"Detected NDEF message with length {tlv_length} bytes")
-        
-        # If data spans multiple blocks, read additional blocks
-        if total_bytes_needed > 16:
-            # Calculate how many additional blocks we need (up to max_blocks)
-            blocks_needed = min((total_bytes_needed - 16 + 15) // 16, max_blocks - 1)
-            
-            # Read additional blocks and append data
-            for i in range(1, blocks_needed + 1):
-                block_num = 4 + i
-                for attempt in range(retries + 1):
-                    try:
-                        additional_data = read_tag_data(block_num)
-                        data += additional_data
-                        break
-                    except Exception as e:
-                        if attempt < retries:
-                            logger.debug(f"Retrying read of NDEF block {block_num}")
-                            time.sleep(0.1)
-                            continue
-                        else:
-                            logger.warning(f"Could not read additional NDEF block {block_num}: {e}")
-                            # We'll process what we have so far
-                            break
-            
-            logger.debug(f"Read {len(data)} bytes of NDEF data")
-    
-    # Look for alternative NDEF format where first byte is length
-    elif len(data) > 2 and data[0] > 0 and data[0] < len(data) and data[1] in [0x01, 0x03, 0xD1]:
-        message_length = data[0]
-        logger.debug(f"Detected alternative NDEF format with length {message_length} bytes")
-        
-        # If data spans multiple blocks, read additional blocks
-        if message_length + 1 > 16:
-            blocks_needed = min((message_length + 1 - 16 + 15) // 16, max_blocks - 1)
-            
-            # Read additional blocks
-            for i in range(1, blocks_needed + 1):
-                try:
-                    additional_data = read_tag_data(4 + i)
-                    data += additional_data
-                except Exception as e:
-                    logger.warning(f"Could not read additional NDEF block {4+i}: {e}")
-                    break
-    
-    # Parse NDEF data
-    ndef_data = parse_ndef_data(data)
-    if not ndef_data:
-        logger.debug("No valid NDEF data found on tag")
-        return None
-        
-    return ndef_data
+    return _controller.authenticate_tag(block, key_type, key)
 
 def read_ndef_data(retries=2):
     """
@@ -570,42 +1899,8 @@ def read_ndef_data(retries=2):
         NFCNoTagError: If no tag is present
         NFCHardwareError: If hardware not initialized
     """
-    # Ensure NFC controller is initialized
-    try:
-        _ensure_initialized()
-    except NFCHardwareError as e:
-        if not _reinitialize_if_needed():
-            raise e
-    
-    # Attempt to read NDEF data with retries
-    for attempt in range(retries + 1):
-        try:
-            ndef_data = _read_ndef_data_internal()
-            
-            if ndef_data:
-                return ndef_data
-            
-            if attempt < retries:
-                logger.debug(f"No valid NDEF data found (attempt {attempt+1}), retrying...")
-                time.sleep(0.1)
-                continue
-            
-            logger.warning("No valid NDEF data found on tag after all attempts")
-            return None
-            
-        except NFCNoTagError:
-            # No point in retrying if tag isn't present
-            raise
-            
-        except Exception as e:
-            if attempt < retries:
-                logger.debug(f"NDEF read attempt {attempt+1} failed: {e}, retrying...")
-                time.sleep(0.1)
-                continue
-            
-            error_msg = f"Error reading NDEF data after {retries+1} attempts: {e}"
-            logger.error(error_msg)
-            raise NFCReadError(error_msg)
+
+    return _controller.read_ndef_data(retries)
 
 def write_ndef_uri(uri, retries=2):
     """
@@ -623,30 +1918,10 @@ def write_ndef_uri(uri, retries=2):
         NFCNoTagError: If no tag is present
         NFCTagNotWritableError: If tag is read-only or incorrectly formatted
         NFCHardwareError: If hardware not initialized
+        ValueError: If the URI is empty or not an http:// or https:// URL
     """
-    if not uri:
-        raise ValueError("URI cannot be empty")
-        
-    # Validate URI format (basic check)
-    if not (uri.startswith('http://') or uri.startswith('https://')):
-        logger.warning(f"URI does not start with http:// or https://: {uri}")
-    
-    # Use the general NDEF writing function but specify only the URL
-    for attempt in range(retries + 1):
-        try:
-            return write_ndef_data(url=uri)
-        except (NFCNoTagError, NFCTagNotWritableError):
-            # No point in retrying these errors
-            raise
-        except Exception as e:
-            if attempt < retries:
-                logger.debug(f"NDEF URI write attempt {attempt+1} failed: {e}, retrying...")
-                time.sleep(0.2)
-                continue
-            
-            error_msg = f"Error writing URI to tag after {retries+1} attempts: {e}"
-            logger.error(error_msg)
-            raise NFCWriteError(error_msg)
+
+    return _controller.write_ndef_uri(uri, retries)
 
 def write_ndef_data(url=None, text=None, retries=2, verify=True):
     """
@@ -667,127 +1942,12 @@ def write_ndef_data(url=None, text=None, retries=2, verify=True):
         NFCTagNotWritableError: If tag is read-only or incorrectly formatted
         NFCHardwareError: If hardware not initialized
     """
-    if not url and not text:
-        raise ValueError("Either url or text must be provided")
-    
-    # Ensure NFC controller is initialized
-    try:
-        _ensure_initialized()
-    except NFCHardwareError as e:
-        if not _reinitialize_if_needed():
-            raise e
-    
-    # Create NDEF formatted data
-    try:
-        ndef_data = create_ndef_data(url=url, text=text)
-    except Exception as e:
-        error_msg = f"Error creating NDEF data: {e}"
-        logger.error(error_msg)
-        raise NFCWriteError(error_msg)
-    
-    # Ensure tag is present before attempting to write
-    if not poll_for_tag():
-        raise NFCNoTagError("No NFC tag detected")
-    
-    # Write data to tag (NDEF data typically starts at block 4)
-    # NDEF data may need multiple blocks
-    blocks_needed = (len(ndef_data) + 15) // 16  # Ceiling division
-    
-    for attempt in range(retries + 1):
-        try:
-            for i in range(blocks_needed):
-                block_data = ndef_data[i*16:i*16+16]
-                block_num = 4 + i
-                
-                # Write block
-                if not write_tag_data(block_data, block_num, verify=True):
-                    raise NFCWriteError(f"Failed to write NDEF data block {block_num}")
-                
-                # Add a small delay between blocks
-                if i < blocks_needed - 1:
-                    time.sleep(0.05)
-            
-            # Verify the NDEF data was written correctly if requested
-            if verify:
-                # Wait briefly for the tag to stabilize
-                time.sleep(0.1)
-                
-                # Try to read back the NDEF data
-                try:
-                    verification_data = read_ndef_data()
-                    
-                    # Basic verification - just check that we got some NDEF data back
-                    if not verification_data or not verification_data.get('records'):
-                        logger.warning("NDEF write verification failed: Could not read back valid NDEF data")
-                        if attempt < retries:
-                            logger.debug("Retrying NDEF write operation")
-                            time.sleep(0.2)
-                            continue
-                        else:
-                            raise NFCWriteError("NDEF verification failed: Could not read back valid NDEF data")
-                    
-                    # More specific verification for NDEF URI
-                    if url:
-                        found_url = False
-                        for record in verification_data.get('records', []):
-                            if record.get('decoded', {}).get('type') == 'uri':
-                                uri_value = record.get('decoded', {}).get('uri')
-                                if uri_value and (uri_value == url or url.endswith(uri_value)):
-                                    found_url = True
-                                    break
-                        
-                        if not found_url:
-                            logger.warning(f"NDEF URI verification failed: URL not found in readback data")
-                            if attempt < retries:
-                                logger.debug("Retrying NDEF URI write operation")
-                                time.sleep(0.2)
-                                continue
-                            # Continue anyway - the data structure might be valid but our parsing is imperfect
-                    
-                    # Specific verification for NDEF Text
-                    if text:
-                        found_text = False
-                        for record in verification_data.get('records', []):
-                            if record.get('decoded', {}).get('type') == 'text':
-                                text_value = record.get('decoded', {}).get('text')
-                                if text_value and text_value == text:
-                                    found_text = True
-                                    break
-                        
-                        if not found_text:
-                            logger.warning(f"NDEF Text verification failed: Text not found in readback data")
-                            if attempt < retries:
-                                logger.debug("Retrying NDEF Text write operation")
-                                time.sleep(0.2)
-                                continue
-                            # Continue anyway - the data structure might be valid but our parsing is imperfect
-                
-                except Exception as e:
-                    logger.warning(f"NDEF verification read failed: {e}")
-                    # Continue anyway - the write might be successful even if verification read fails
-            
-            logger.info("Successfully wrote NDEF data to tag")
-            return True
-            
-        except NFCNoTagError:
-            # No point in retrying if tag isn't present
-            raise
-            
-        except NFCTagNotWritableError:
-            # No point in retrying if tag is read-only
-            raise
-            
-        except Exception as e:
-            if attempt < retries:
-                logger.debug(f"NDEF write attempt {attempt+1} failed: {e}, retrying...")
-                time.sleep(0.2)
-                continue
-            
-            error_msg = f"Error writing NDEF data after {retries+1} attempts: {e}"
-            logger.error(error_msg)
-            raise NFCWriteError(error_msg)
 
-def continuous_poll(callback, interval=0.1, exit_event=None, read_ndef=False, deduplicate=True):
+    return _controller.write_ndef_data(url, text, retries, verify)
+
+def continuous_poll(callback, interval=0.1, exit_event=None, read_ndef=False, deduplicate=True,
+                    max_interval=1.0, use_irq=True, backoff=1.5, min_interval=0.02,
+                    on_remove=None, miss_threshold=3):
     """
     Continuously poll for NFC tags and call the callback function when detected.
     
@@ -796,102 +1956,48 @@ def continuous_poll(callback, interval=0.1, exit_event=None, read_ndef=False, de
                              If read_ndef is False: Called with UID string parameter
                              If read_ndef is True: Called with (UID string, NDEF data) tuple
         interval (float): Polling interval in seconds
-        exit_event (threading.Event, optional): Event to signal when to stop polling
+        exit_event (threading.Event, optional): Event to signal when to stop polling.
+                                                Defaults to a shared module event that
+                                                stop_continuous_poll() sets.
         read_ndef (bool): Whether to read NDEF data from detected tags
         deduplicate (bool): Only trigger callback when a new tag is detected (not on every poll)
+        max_interval (float): Upper bound for the polling interval while no tag is present.
+                              The interval grows by `backoff` on each empty poll up to
+                              this cap and resets to `interval` as soon as a tag is detected.
+        use_irq (bool): Sleep on the PN532 IRQ line while no tag is present, if an
+                        IRQ pin was passed to initialize(). Set to False to force the
+                        timed polling fallback.
+        backoff (float): Factor the idle polling interval grows by after each empty poll
+        min_interval (float): Delay before the first re-poll after a new tag is detected,
+                              so a tag that is only briefly presented is seen leaving
+                              (or being swapped) without waiting a full interval
+        on_remove (function, optional): Called with the UID string once a detected tag
+                                        has left the reader
+        miss_threshold (int): Consecutive empty polls before a detected tag counts as
+                              removed. Debounces RF dropouts: until then the tag is
+                              neither reported as removed nor re-reported on its return.
         
     Note:
         This function runs in a loop and is typically called in a separate thread.
+        The callback runs on its own consumer thread, fed through a lock-free
+        ring buffer, so a slow callback does not delay the next poll.
+        Stop polling by setting exit_event (e.g. from a SIGINT handler); every
+        wait in the loop returns as soon as it is set.
     """
-    last_uid = None
-    tag_present = False
-    consecutive_errors = 0
-    
-    # Create an exit event if one wasn't provided
-    if exit_event is None:
-        exit_event = threading.Event()
-    
-    logger.info(f"Starting continuous polling with interval {interval}s, read_ndef={read_ndef}")
-    
-    try:
-        # Ensure NFC controller is initialized before starting
-        if not _initialized or _nfc_reader is None:
-            if not _reinitialize_if_needed():
-                logger.error("Could not initialize NFC controller for continuous polling")
-                return
-        
-        while not exit_event.is_set():
-            try:
-                # Poll for tag (with or without NDEF data)
-                result = poll_for_tag(read_ndef=read_ndef)
-                
-                # Reset error counter on successful poll
-                consecutive_errors = 0
-                
-                # If no tag detected
-                if not result:
-                    # If a tag was previously present, now it's gone
-                    if tag_present:
-                        tag_present = False
-                        logger.debug("Tag removed")
-                    
-                    # Clear last UID if we're deduplicating
-                    if deduplicate:
-                        last_uid = None
-                    
-                    time.sleep(interval)
-                    continue
-                
-                # Extract UID (and possibly NDEF data) from result
-                if read_ndef:
-                    uid, ndef_data = result
-                else:
-                    uid = result
-                    ndef_data = None
-                
-                # Tag is present
-                tag_present = True
-                
-                # Check if this is a new tag or we're not deduplicating
-                if not deduplicate or uid != last_uid:
-                    # Call callback with appropriate parameters
-                    try:
-                        if read_ndef:
-                            callback(uid, ndef_data)
-                        else:
-                            callback(uid)
-                        
-                        # Update last seen UID
-                        last_uid = uid
-                        
-                    except Exception as e:
-                        logger.error(f"Error in tag detection callback: {e}")
-                
-                # Wait for next poll
-                time.sleep(interval)
-                
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"Error during continuous polling: {e}")
-                
-                # If we have too many consecutive errors, try to reinitialize
-                if consecutive_errors >= 5:
-                    logger.warning("Too many consecutive errors, attempting to reinitialize NFC controller")
-                    try:
-                        shutdown()
-                        time.sleep(0.5)
-                        if not initialize():
-                            logger.error("Failed to reinitialize NFC controller, stopping continuous poll")
-                            return
-                        consecutive_errors = 0
-                    except Exception as reinit_e:
-                        logger.error(f"Error reinitializing NFC controller: {reinit_e}")
-                        return
-                
-                # Don't exit the loop, try again after a short delay
-                time.sleep(interval)
-                
-    except KeyboardInterrupt:
-        logger.info("Continuous polling stopped by keyboard interrupt")
-    finally:
-        logger.info("Continuous polling stopped")
\ No newline at end of file
+
+    return _controller.continuous_poll(callback, interval, exit_event, read_ndef, deduplicate,
+                                       max_interval, use_irq, backoff, min_interval,
+                                       on_remove, miss_threshold)
+
+def stop_continuous_poll():
+    """
+    Stop a continuous_poll() loop that was started without its own exit_event.
+    """
+
+    return _controller.stop_continuous_poll()
+
+def __getattr__(name):
+    # Older callers read the initialization flag straight off the module
+    if name == '_initialized':
+        return _controller.initialized
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
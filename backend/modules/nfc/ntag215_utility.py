@@ -21,16 +21,18 @@ if parent_dir not in sys.path:
 
 try:
     from backend.modules.nfc import (
-        initialize, shutdown, poll_for_tag, read_tag_data, write_tag_data
+        initialize, shutdown, get_reader, poll_for_tag_raw, read_tag_data, write_tag_data,
+        NFCHardwareError
     )
-    from backend.modules.nfc.hardware_interface import NFCReader
+    from backend.modules.nfc.tag_processor import format_uid
 except ImportError:
     # Fallback to direct imports if the package structure doesn't match
     sys.path.insert(0, current_dir)
     from nfc_controller import (
-        initialize, shutdown, poll_for_tag, read_tag_data, write_tag_data
+        initialize, shutdown, get_reader, poll_for_tag_raw, read_tag_data, write_tag_data
     )
-    from hardware_interface import NFCReader
+    from tag_processor import format_uid
+    from exceptions import NFCHardwareError
 
 # Configure logging
 logging.basicConfig(
@@ -39,254 +41,292 @@ logging.basicConfig(
 )
 logger = logging.getLogger("NTAG215Utility")
 
-def read_full_tag(i2c_bus=1, i2c_address=0x24):
-    """Read all available user memory from an NTAG215 tag."""
-    print("\n=== Reading NTAG215 Tag ===")
-    print("Please place tag on the reader...")
+# Maps printable ASCII bytes to themselves and everything else to '.'
+_PRINTABLE_TBL = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+
+# (block, first page, last page shown) for the dumped blocks 0-32 (pages 0-130)
+_PAGE_RANGES = tuple((block, block * 4, min(block * 4 + 3, 130)) for block in range(33))
+
+def _wait_for_tag(timeout=5.0):
+    """
+    Wait for a tag to be placed on the reader.
     
-    # Initialize NFC reader
-    if not initialize(i2c_bus, i2c_address):
-        print("❌ Failed to initialize NFC controller")
-        return
+    Polls quickly at first and backs off to a capped interval, so a tag that is
+    already in place is picked up almost immediately without spinning.
     
-    try:
-        # Wait for tag (up to 5 seconds)
-        start_time = time.time()
-        uid = None
-        while time.time() - start_time < 5:
-            uid = poll_for_tag()
-            if uid:
-                break
-            time.sleep(0.1)
-        
-        if not uid:
-            print("❌ No tag detected within timeout")
-            return
+    Args:
+        timeout (float): Maximum time to wait in seconds
         
-        print(f"✅ Tag detected! UID: {uid}")
+    Returns:
+        bytes or None: Raw tag UID if detected within the timeout, None otherwise
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while True:
+        raw_uid = poll_for_tag_raw()
+        if raw_uid:
+            return raw_uid
         
-        # Create direct access to hardware interface for tag type detection
-        reader = NFCReader(i2c_bus, i2c_address)
-        reader.connect()
-        reader.poll()  # This will set _last_tag_uid
-        
-        tag_type = reader.detect_tag_type()
-        print(f"📋 Tag type: {tag_type}")
-        
-        if tag_type != "ntag215":
-            print("⚠️ Tag may not be an NTAG215. Reading may not work as expected.")
-        
-        # Read all user memory (pages 4-130 for NTAG215)
-        # This translates to blocks 1-32 (since 1 block = 4 pages)
-        print("\n=== NTAG215 Memory Content ===")
-        print("Block | Pages | Content (hex) | ASCII")
-        print("------+-------+--------------+-------")
-        
-        all_data = {}
-        for block in range(0, 33):  # Block 0-32 (pages 0-130)
-            try:
-                start_page = block * 4
-                end_page = start_page + 3
-                
-                # Skip blocks beyond page 130
-                if start_page > 130:
-                    continue
-                
-                data = read_tag_data(block)
-                all_data[block] = data
-                
-                # Try to convert to ASCII for display
-                ascii_str = ""
-                for byte in data:
-                    if 32 <= byte <= 126:  # Printable ASCII
-                        ascii_str += chr(byte)
-                    else:
-                        ascii_str += "."
-                
-                print(f"{block:5d} | {start_page:3d}-{min(end_page, 130):3d} | {data.hex()} | {ascii_str}")
-                
-            except Exception as e:
-                print(f"{block:5d} | {start_page:3d}-{min(end_page, 130):3d} | Error: {str(e)}")
-        
-        return all_data
-        
-    except Exception as e:
-        print(f"❌ Error during tag reading: {str(e)}")
-    finally:
-        shutdown()
-        print("\n✅ NFC controller shut down")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, 0.05)
 
-def write_text_to_tag(text, block=1, i2c_bus=1, i2c_address=0x24):
-    """Write text to an NTAG215 tag."""
-    print(f"\n=== Writing Text to NTAG215 Tag ===")
-    print(f"Text: {text}")
-    print("Please place tag on the reader...")
+class NTAG215Session:
+    """
+    One NFC hardware session for a sequence of NTAG215 operations.
     
-    # Initialize NFC reader
-    if not initialize(i2c_bus, i2c_address):
-        print("❌ Failed to initialize NFC controller")
+    Initializes the controller on entry and shuts it down on exit, so several
+    operations on the same tag share a single hardware setup:
+    
+        with NTAG215Session(bus, address) as session:
+            if session.wait_tag():
+                session.dump()
+                session.check_protection()
+    
+    Raises:
+        NFCHardwareError: On entry, if the NFC controller cannot be initialized
+    """
+    
+    def __init__(self, i2c_bus=1, i2c_address=0x24):
+        self.i2c_bus = i2c_bus
+        self.i2c_address = i2c_address
+        self.reader = None
+        self.uid = None
+        self.tag_type = None
+    
+    def __enter__(self):
+        if not initialize(self.i2c_bus, self.i2c_address):
+            raise NFCHardwareError("Failed to initialize NFC controller")
+        self.reader = get_reader()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        shutdown()
+        print("\n✅ NFC controller shut down")
         return False
     
-    try:
-        # Wait for tag (up to 5 seconds)
-        start_time = time.time()
-        uid = None
-        while time.time() - start_time < 5:
-            uid = poll_for_tag()
-            if uid:
-                break
-            time.sleep(0.1)
+    def wait_tag(self, timeout=5.0):
+        """
+        Wait for a tag and detect its type.
         
-        if not uid:
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if a tag was detected, False otherwise
+        """
+        print("Please place tag on the reader...")
+        
+        self.uid = _wait_for_tag(timeout)
+        if not self.uid:
             print("❌ No tag detected within timeout")
             return False
         
-        print(f"✅ Tag detected! UID: {uid}")
-        
-        # Create direct access to hardware interface for tag type detection
-        reader = NFCReader(i2c_bus, i2c_address)
-        reader.connect()
-        reader.poll()  # This will set _last_tag_uid
-        
-        tag_type = reader.detect_tag_type()
-        print(f"📋 Tag type: {tag_type}")
+        print(f"✅ Tag detected! UID: {format_uid(self.uid)}")
         
-        if tag_type != "ntag215":
-            print("⚠️ Tag may not be an NTAG215. Writing may not work as expected.")
-        
-        # Convert text to bytes and pad to 16 bytes
-        data = text.encode('utf-8')
-        if len(data) > 16:
-            print(f"⚠️ Text too long, truncating to 16 bytes")
-            data = data[:16]
+        # Classify the tag the poll above selected, without polling it again
+        self.tag_type = self.reader.detect_tag_type(self.uid)
+        print(f"📋 Tag type: {self.tag_type}")
+        return True
+    
+    def dump(self):
+        """
+        Read and print all available memory of the detected tag.
         
-        data = data.ljust(16, b'\x00')
+        Returns:
+            dict or None: Block number to 16 bytes of block data, None on error
+        """
+        if self.tag_type != "ntag215":
+            print("⚠️ Tag may not be an NTAG215. Reading may not work as expected.")
         
-        # Write to specified block
-        print(f"Writing data to block {block} (pages {block*4}-{block*4+3})...")
-        if write_tag_data(data, block):
-            print(f"✅ Successfully wrote text to block {block}")
-            return True
-        else:
-            print(f"❌ Failed to write text to block {block}")
-            return False
+        try:
+            # Read all user memory (pages 4-130 for NTAG215)
+            # This translates to blocks 1-32 (since 1 block = 4 pages)
+            print("\n=== NTAG215 Memory Content ===")
+            print("Block | Pages | Content (hex) | ASCII")
+            print("------+-------+--------------+-------")
             
-    except Exception as e:
-        print(f"❌ Error during tag writing: {str(e)}")
-        return False
-    finally:
-        shutdown()
-        print("\n✅ NFC controller shut down")
-
-def check_protection_status(i2c_bus=1, i2c_address=0x24):
-    """Check protection status of an NTAG215 tag."""
-    print("\n=== Checking NTAG215 Protection Status ===")
-    print("Please place tag on the reader...")
-    
-    # Initialize NFC reader
-    if not initialize(i2c_bus, i2c_address):
-        print("❌ Failed to initialize NFC controller")
-        return
+            # Fetch pages 0-131 in a few FAST_READ exchanges rather than 33 block
+            # reads; fall back to reading block by block if the tag rejects it
+            fast_data = None
+            if self.tag_type == "ntag215":
+                try:
+                    fast_data = self.reader.ntag2xx_fast_read(0, 131)
+                except Exception as e:
+                    logger.debug("FAST_READ failed, reading block by block: %s", e)
+            
+            # Rows are collected and printed in one go rather than a print per block
+            all_data = {}
+            rows = []
+            for block, start_page, end_page in _PAGE_RANGES:
+                try:
+                    if fast_data is not None:
+                        data = fast_data[block * 16:(block + 1) * 16]
+                    else:
+                        data = read_tag_data(block)
+                    all_data[block] = data
+                    
+                    # Convert to ASCII for display, non-printable bytes as '.'
+                    ascii_str = data.translate(_PRINTABLE_TBL).decode('ascii')
+                    
+                    rows.append(f"{block:5d} | {start_page:3d}-{end_page:3d} | {data.hex()} | {ascii_str}")
+                    
+                except Exception as e:
+                    rows.append(f"{block:5d} | {start_page:3d}-{end_page:3d} | Error: {str(e)}")
+            
+            print('\n'.join(rows))
+            return all_data
+            
+        except Exception as e:
+            print(f"❌ Error during tag reading: {str(e)}")
+            return None
     
-    try:
-        # Wait for tag (up to 5 seconds)
-        start_time = time.time()
-        uid = None
-        while time.time() - start_time < 5:
-            uid = poll_for_tag()
-            if uid:
-                break
-            time.sleep(0.1)
-        
-        if not uid:
-            print("❌ No tag detected within timeout")
-            return
-        
-        print(f"✅ Tag detected! UID: {uid}")
-        
-        # Create direct access to hardware interface
-        reader = NFCReader(i2c_bus, i2c_address)
-        reader.connect()
-        reader.poll()  # This will set _last_tag_uid
-        
-        tag_type = reader.detect_tag_type()
-        print(f"📋 Tag type: {tag_type}")
+    def write_text(self, text, block=1):
+        """
+        Write text, truncated or zero-padded to 16 bytes, to one block of the detected tag.
         
-        if tag_type != "ntag215":
-            print("⚠️ Tag may not be an NTAG215. Protection check may not be accurate.")
-        
-        # Check if the tag is read-only
-        is_read_only = reader.is_tag_read_only()
-        if is_read_only:
-            print("🔒 Tag appears to be READ-ONLY or write-protected")
-        else:
-            print("✅ Tag appears to be WRITABLE")
+        Args:
+            text (str): Text to write
+            block (int): Block number to write to (block 1 is pages 4-7)
+            
+        Returns:
+            bool: True if the write succeeded, False otherwise
+        """
+        if self.tag_type != "ntag215":
+            print("⚠️ Tag may not be an NTAG215. Writing may not work as expected.")
         
-        # Read static lock bytes (pages 2-3)
         try:
-            lock_data = read_tag_data(0)  # Block 0 contains pages 0-3
-            # Lock bytes are at the end of page 2 and beginning of page 3
-            lock_bytes = lock_data[10:12]
-            print(f"\nStatic Lock Bytes: {lock_bytes.hex()}")
+            # Convert text to bytes and pad to 16 bytes
+            data = text.encode('utf-8')
+            if len(data) > 16:
+                print(f"⚠️ Text too long, truncating to 16 bytes")
+                data = data[:16]
             
-            if lock_bytes[0] != 0 or lock_bytes[1] != 0:
-                print("🔒 Static lock bytes are set - some pages may be locked")
-                # Detailed lock bit analysis could be added here
+            data = data.ljust(16, b'\x00')
+            
+            # Write to specified block
+            print(f"Writing data to block {block} (pages {block*4}-{block*4+3})...")
+            if write_tag_data(data, block):
+                print(f"✅ Successfully wrote text to block {block}")
+                return True
             else:
-                print("✅ No static lock bits are set")
+                print(f"❌ Failed to write text to block {block}")
+                return False
                 
         except Exception as e:
-            print(f"❌ Error reading lock bytes: {str(e)}")
+            print(f"❌ Error during tag writing: {str(e)}")
+            return False
+    
+    def check_protection(self):
+        """Print the read-only, lock byte and password protection status of the detected tag."""
+        if self.tag_type != "ntag215":
+            print("⚠️ Tag may not be an NTAG215. Protection check may not be accurate.")
         
-        # Read dynamic lock bytes (page 130)
+        # Report lines are collected and printed together at the end
+        lines = []
         try:
-            # Block 32 contains pages 128-131
-            config_data = read_tag_data(32)
-            # Dynamic lock bytes are in page 130 (3rd page in the block)
-            dynamic_lock = config_data[8:12]
-            print(f"\nDynamic Lock Bytes: {dynamic_lock.hex()}")
-            
-            if any(b != 0 for b in dynamic_lock):
-                print("🔒 Dynamic lock bytes are set - some pages may be locked")
-                # Detailed lock bit analysis could be added here
+            # Check if the tag is read-only
+            is_read_only = self.reader.is_tag_read_only()
+            if is_read_only:
+                lines.append("🔒 Tag appears to be READ-ONLY or write-protected")
             else:
-                print("✅ No dynamic lock bits are set")
+                lines.append("✅ Tag appears to be WRITABLE")
+            
+            # Read static lock bytes (pages 2-3)
+            try:
+                lock_data = read_tag_data(0)  # Block 0 contains pages 0-3
+                # Lock bytes are at the end of page 2 and beginning of page 3
+                lock_bytes = lock_data[10:12]
+                lines.append(f"\nStatic Lock Bytes: {lock_bytes.hex()}")
+            
+                if lock_bytes[0] != 0 or lock_bytes[1] != 0:
+                    lines.append("🔒 Static lock bytes are set - some pages may be locked")
+                    # Detailed lock bit analysis could be added here
+                else:
+                    lines.append("✅ No static lock bits are set")
                 
-        except Exception as e:
-            print(f"❌ Error reading dynamic lock bytes: {str(e)}")
+            except Exception as e:
+                lines.append(f"❌ Error reading lock bytes: {str(e)}")
         
-        # Check for password protection (pages 133-134)
-        try:
-            # Page 133 is in block 33 (beyond normal range)
-            # Create a direct reader instance to access it
-            auth_data = None
+            # Read dynamic lock bytes (page 130)
             try:
-                start_page = 133
-                # Use reader's page-level methods to directly access
-                # the configuration pages
-                auth_data = reader._pn532.ntag2xx_read_block(133)
-                print(f"\nPassword Protection: {auth_data.hex() if auth_data else 'None'}")
-                
-                if auth_data and auth_data[0] != 0:
-                    print("🔒 Password protection appears to be enabled")
+                # Block 32 contains pages 128-131
+                config_data = read_tag_data(32)
+                # Dynamic lock bytes are in page 130 (3rd page in the block)
+                dynamic_lock = config_data[8:12]
+                lines.append(f"\nDynamic Lock Bytes: {dynamic_lock.hex()}")
+            
+                if any(b != 0 for b in dynamic_lock):
+                    lines.append("🔒 Dynamic lock bytes are set - some pages may be locked")
+                    # Detailed lock bit analysis could be added here
                 else:
-                    print("✅ No password protection detected")
+                    lines.append("✅ No dynamic lock bits are set")
+                
             except Exception as e:
-                print(f"👉 Password protection status: Could not determine ({str(e)})")
+                lines.append(f"❌ Error reading dynamic lock bytes: {str(e)}")
+        
+            # Check for password protection (pages 133-134)
+            try:
+                # Page 133 is in block 33 (beyond normal range)
+                # Use the session's reader to access it directly
+                auth_data = None
+                try:
+                    start_page = 133
+                    # Use reader's page-level methods to directly access
+                    # the configuration pages
+                    auth_data = self.reader._pn532.ntag2xx_read_block(133)
+                    lines.append(f"\nPassword Protection: {auth_data.hex() if auth_data else 'None'}")
                 
-        except Exception as e:
-            print(f"❌ Error checking password protection: {str(e)}")
+                    if auth_data and auth_data[0] != 0:
+                        lines.append("🔒 Password protection appears to be enabled")
+                    else:
+                        lines.append("✅ No password protection detected")
+                except Exception as e:
+                    lines.append(f"👉 Password protection status: Could not determine ({str(e)})")
+                
+            except Exception as e:
+                lines.append(f"❌ Error checking password protection: {str(e)}")
             
-    except Exception as e:
-        print(f"❌ Error during protection check: {str(e)}")
-    finally:
-        try:
-            if reader:
-                reader.disconnect()
-        except:
-            pass
-        shutdown()
-        print("\n✅ NFC controller shut down")
+        except Exception as e:
+            lines.append(f"❌ Error during protection check: {str(e)}")
+        
+        print('\n'.join(lines))
+
+def read_full_tag(i2c_bus=1, i2c_address=0x24):
+    """Read all available user memory from an NTAG215 tag."""
+    print("\n=== Reading NTAG215 Tag ===")
+    
+    try:
+        with NTAG215Session(i2c_bus, i2c_address) as session:
+            if session.wait_tag():
+                return session.dump()
+    except NFCHardwareError as e:
+        print(f"❌ {str(e)}")
+
+def write_text_to_tag(text, block=1, i2c_bus=1, i2c_address=0x24):
+    """Write text to an NTAG215 tag."""
+    print(f"\n=== Writing Text to NTAG215 Tag ===")
+    print(f"Text: {text}")
+    
+    try:
+        with NTAG215Session(i2c_bus, i2c_address) as session:
+            return session.wait_tag() and session.write_text(text, block)
+    except NFCHardwareError as e:
+        print(f"❌ {str(e)}")
+        return False
+
+def check_protection_status(i2c_bus=1, i2c_address=0x24):
+    """Check protection status of an NTAG215 tag."""
+    print("\n=== Checking NTAG215 Protection Status ===")
+    
+    try:
+        with NTAG215Session(i2c_bus, i2c_address) as session:
+            if session.wait_tag():
+                session.check_protection()
+    except NFCHardwareError as e:
+        print(f"❌ {str(e)}")
 
 def main():
     parser = argparse.ArgumentParser(description='NTAG215 Tag Utility Script')
@@ -3,6 +3,7 @@ tag_processor.py - Functions for processing NFC tag data.
 """
 
 import logging
+import re
 import struct
 from .exceptions import NFCError
 
@@ -23,15 +24,10 @@ def format_uid(raw_uid):
         return None
         
     try:
-        # Convert bytes to uppercase hex string with no spaces
-        uid_hex = raw_uid.hex().upper()
-        
-        # Format with colons for readability (e.g., "AA:BB:CC:DD")
-        uid_formatted = ':'.join(uid_hex[i:i+2] for i in range(0, len(uid_hex), 2))
-        
-        return uid_formatted
+        # Uppercase hex with colons for readability (e.g., "AA:BB:CC:DD")
+        return raw_uid.hex(':').upper()
     except Exception as e:
-        logger.error(f"Error formatting UID: {str(e)}")
+        logger.error("Error formatting UID: %s", e)
         return None
 
 # NDEF Record Type Definitions
@@ -48,7 +44,7 @@ NDEF_RTD_TEXT = b'T'
 NDEF_RTD_URI = b'U'
 
 # URI Record Type prefixes
-URI_PREFIXES = [
+URI_PREFIXES = (
     '',                            # 0x00
     'http://www.',                # 0x01
     'https://www.',               # 0x02
@@ -85,7 +81,123 @@ URI_PREFIXES = [
     'urn:epc:raw:',               # 0x21
     'urn:epc:',                   # 0x22
     'urn:nfc:',                   # 0x23
-]
+)
+_URI_PREFIXES_LEN = len(URI_PREFIXES)
+
+# URI_PREFIXES pre-encoded, so create_ndef_data() matches on the encoded URL
+_URI_PREFIX_BYTES = tuple(prefix.encode('ascii') for prefix in URI_PREFIXES)
+
+def _group_uri_prefixes():
+    """
+    Internal helper grouping the URI prefixes by their first 4 bytes.
+    
+    Every prefix is at least 4 bytes long, so a URL's first 4 bytes select the
+    only candidates that can match it.
+    
+    Returns:
+        dict: First 4 bytes to a tuple of (index, prefix) pairs, longest prefix
+              first so the first match found is the most specific one (e.g.
+              b'urn:epc:id:' rather than b'urn:')
+    """
+    groups = {}
+    for i, prefix in sorted(enumerate(_URI_PREFIX_BYTES), key=lambda item: -len(item[1])):
+        if prefix:
+            groups.setdefault(prefix[:4], []).append((i, prefix))
+    return {key: tuple(candidates) for key, candidates in groups.items()}
+
+_URI_PREFIX_GROUPS = _group_uri_prefixes()
+
+# Complete TLV + record header for a lone short https:// URI record:
+# NDEF Message TLV (0x03, length), MB|ME|SR|Well-known (0xD1), type length 1,
+# payload length, type 'U', prefix code 0x04. Both length bytes are patched in.
+_HTTPS_URI_TEMPLATE = b'\x03\x00\xd1\x01\x00U\x04'
+_HTTPS_URI_MAX_TAIL = 249  # Keeps the TLV length below the 3-byte format
+
+# Common NDEF header values, used to resynchronise on non-standard layouts
+_NDEF_HEADER_BYTES = frozenset((0x03, 0xD1, 0x91, 0x51, 0x11, 0x01))
+_NDEF_HEADER_RE = re.compile(b'[\\x03\\xd1\\x91\\x51\\x11\\x01]')
+
+# Precompiled record length fields: type length + payload length for short
+# (1-byte) and normal (4-byte) records, and the 3-byte TLV length format
+_SR_LENGTHS = struct.Struct('>BB')
+_LONG_LENGTHS = struct.Struct('>BI')
+_TLV_LONG_LENGTH = struct.Struct('>H')
+
+# Precompiled record headers written by create_ndef_data: header byte, type
+# length and payload length for short and normal records
+_SR_RECORD_HEADER = struct.Struct('>BBB')
+_LONG_RECORD_HEADER = struct.Struct('>BBI')
+
+# Record header byte decoded into (MB, ME, CF, SR, IL, TNF) for every value
+_NDEF_HEADER_FLAGS = tuple(
+    ((h & 0x80) != 0, (h & 0x40) != 0, (h & 0x20) != 0, (h & 0x10) != 0, (h & 0x08) != 0, h & 0x07)
+    for h in range(256)
+)
+
+def _decode_text(payload):
+    """
+    Internal helper decoding the payload of a well-known Text record.
+    
+    Args:
+        payload (bytes): Record payload (status byte, language code, text)
+    
+    Returns:
+        dict or None: Decoded record with type, language, encoding and text, or
+                      None if the payload is too short for its language code
+    
+    Raises:
+        UnicodeDecodeError: If the language code or text cannot be decoded
+    """
+    if not payload:
+        return None
+    
+    status_byte = payload[0]
+    language_code_length = status_byte & 0x3F
+    if len(payload) < 1 + language_code_length:
+        return None
+    encoding = 'utf-16' if (status_byte & 0x80) else 'utf-8'
+    
+    language_code = payload[1:1+language_code_length].decode('ascii')
+    text = payload[1+language_code_length:].decode(encoding)
+    
+    return {
+        'type': 'text',
+        'language': language_code,
+        'encoding': encoding,
+        'text': text
+    }
+
+def _decode_uri(payload):
+    """
+    Internal helper decoding the payload of a well-known URI record.
+    
+    Args:
+        payload (bytes): Record payload (prefix code, URI tail)
+    
+    Returns:
+        dict or None: Decoded record with type and the full URI, or None if the
+                      payload is empty
+    
+    Raises:
+        UnicodeDecodeError: If the URI tail is not valid UTF-8
+    """
+    if not payload:
+        return None
+    
+    prefix_index = payload[0]
+    prefix = URI_PREFIXES[prefix_index] if prefix_index < _URI_PREFIXES_LEN else ''
+    uri = prefix + payload[1:].decode('utf-8')
+    
+    return {
+        'type': 'uri',
+        'uri': uri
+    }
+
+# Decoders for well-known record types, keyed by record type
+_RTD_DECODERS = {
+    NDEF_RTD_TEXT: _decode_text,
+    NDEF_RTD_URI: _decode_uri,
+}
 
 def parse_ndef_data(data):
     """
@@ -100,200 +212,208 @@ def parse_ndef_data(data):
     if not data or len(data) < 2:
         return None
     
-    try:
-        result = {
-            'message_type': 'NDEF',
-            'records': []
-        }
+    return {
+        'message_type': 'NDEF',
+        'records': list(parse_ndef_records(data))
+    }
+
+def parse_ndef_records(data):
+    """
+    Parse the records of NDEF formatted data from tag one at a time.
+    
+    Records are parsed as they are consumed, so a caller that only needs the
+    first matching record does not decode the rest, e.g.
+    next((r for r in parse_ndef_records(data) if 'decoded' in r), None).
+
+    Args:
+        data (bytes): Raw data read from tag
+
+    Yields:
+        dict: Parsed NDEF record, as found in parse_ndef_data()['records']
+    """
+    if not data or len(data) < 2:
+        return
+    
+    # Work on a memoryview so slicing below never copies; bytes are only
+    # materialised when a record is built
+    data = memoryview(data)
+    
+    # Special handling for NTAG215 tags
+    # NTAG215 tags use Type 2 Tag format with a specific TLV structure:
+    # - Byte 0: TLV Tag (0x03 for NDEF)
+    # - Byte 1: TLV Length
+    # - Bytes 2+: NDEF Message
+
+    # Check for Type 2 Tag structure (common for NTAG215)
+    if data[0] == 0x03:  # Type 2 Tag, NDEF Message TLV
+        # Parse TLV structure
+        tlv_type = data[0]
         
-        # Special handling for NTAG215 tags
-        # NTAG215 tags use Type 2 Tag format with a specific TLV structure:
-        # - Byte 0: TLV Tag (0x03 for NDEF)
-        # - Byte 1: TLV Length
-        # - Bytes 2+: NDEF Message
-
-        # Check for Type 2 Tag structure (common for NTAG215)
-        if data[0] == 0x03:  # Type 2 Tag, NDEF Message TLV
-            # Parse TLV structure
-            tlv_type = data[0]
-            
-            # Check for 3-byte length format
-            if len(data) > 1 and data[1] == 0xFF and len(data) >= 4:
-                # 3-byte length format
-                tlv_length = int.from_bytes(data[2:4], byteorder='big')
-                start_offset = 4  # After the 3-byte length field
-                logger.debug(f"Found TLV with 3-byte length format: {tlv_length} bytes")
-            else:
-                # Standard 1-byte length format
-                tlv_length = data[1]
-                start_offset = 2  # After the 1-byte length field
-            
-            # If we find a valid NDEF TLV block
-            if tlv_type == 0x03 and tlv_length > 0 and len(data) >= tlv_length + start_offset:
-                # Extract the NDEF message from the TLV
-                ndef_data = data[start_offset:start_offset+tlv_length]
-                
-                # Now process the NDEF message
-                data = ndef_data
-                logger.debug(f"Extracted {len(ndef_data)} bytes of NDEF data from TLV")
+        # Check for 3-byte length format
+        if len(data) > 1 and data[1] == 0xFF and len(data) >= 4:
+            # 3-byte length format
+            tlv_length = _TLV_LONG_LENGTH.unpack_from(data, 2)[0]
+            start_offset = 4  # After the 3-byte length field
+            logger.debug("Found TLV with 3-byte length format: %s bytes", tlv_length)
+        else:
+            # Standard 1-byte length format
+            tlv_length = data[1]
+            start_offset = 2  # After the 1-byte length field
+        
+        # If we find a valid NDEF TLV block
+        if tlv_type == 0x03 and tlv_length > 0 and len(data) >= tlv_length + start_offset:
+            # Extract the NDEF message from the TLV
+            ndef_data = data[start_offset:start_offset+tlv_length]
             
-        # Check for NTAG215 common format where the first byte is the NDEF message length
-        elif len(data) > 2 and data[0] > 0 and data[0] < len(data) and data[1] in [0x01, 0x03, 0xD1]:
-            # This might be an NTAG215 with the message length as the first byte
-            message_length = data[0]
-            if message_length < len(data):
-                # Extract the actual NDEF message
-                data = data[1:1+message_length]
+            # Now process the NDEF message
+            data = ndef_data
+            logger.debug("Extracted %s bytes of NDEF data from TLV", len(ndef_data))
         
-        offset = 0
+    # Check for NTAG215 common format where the first byte is the NDEF message length
+    elif len(data) > 2 and data[0] > 0 and data[0] < len(data) and data[1] in [0x01, 0x03, 0xD1]:
+        # This might be an NTAG215 with the message length as the first byte
+        message_length = data[0]
+        if message_length < len(data):
+            # Extract the actual NDEF message
+            data = data[1:1+message_length]
+    
+    offset = 0
+    
+    # Process each record in the NDEF message
+    while offset < len(data):
+        # Parse header byte
+        header = data[offset]
+        offset += 1
         
-        # Process each record in the NDEF message
-        while offset < len(data):
-            # Check if we have at least one byte to read the header
-            if offset >= len(data):
+        # Check if this is terminative TLV (0xFE)
+        if header == 0xFE:
+            # End of NDEF message, finished processing
+            break
+            
+        # Check if this is null TLV (0x00), just skip it and continue
+        if header == 0x00:
+            continue
+            
+        # If not a standard NDEF record header, we might be dealing with a non-standard format
+        if header not in _NDEF_HEADER_BYTES:
+            # Try to reset and scan the next 10 bytes for a valid NDEF header
+            match = _NDEF_HEADER_RE.search(data, offset, offset + 10)
+            if not match:
+                # No valid header found, stop processing
                 break
-                
-            # Parse header byte
+            
+            offset = match.start()
             header = data[offset]
             offset += 1
-            
-            # Check if this is terminative TLV (0xFE)
-            if header == 0xFE:
-                # End of NDEF message, finished processing
+        
+        # Message Begin, Message End, Chunk Flag, Short Record,
+        # ID Length present, Type Name Format
+        mb, me, cf, sr, il, tnf = _NDEF_HEADER_FLAGS[header]
+        
+        # Type length plus payload length - short record (1 byte) or normal (4 bytes)
+        if sr:
+            if offset + 2 > len(data):
                 break
-                
-            # Check if this is null TLV (0x00), just skip it and continue
-            if header == 0x00:
-                continue
-                
-            # If not a standard NDEF record header, we might be dealing with a non-standard format
-            if header not in [0x03, 0xD1, 0x91, 0x51, 0x11, 0x01]:  # Common NDEF header values
-                # Try to reset and scan for a valid NDEF header
-                found_header = False
-                for i in range(offset, min(offset + 10, len(data))):
-                    if data[i] in [0x03, 0xD1, 0x91, 0x51, 0x11, 0x01]:
-                        offset = i
-                        header = data[offset]
-                        offset += 1
-                        found_header = True
-                        break
-                
-                if not found_header:
-                    # No valid header found, stop processing
-                    break
-            
-            mb = (header & 0x80) != 0  # Message Begin
-            me = (header & 0x40) != 0  # Message End
-            cf = (header & 0x20) != 0  # Chunk Flag
-            sr = (header & 0x10) != 0  # Short Record
-            il = (header & 0x08) != 0  # ID Length present
-            tnf = header & 0x07        # Type Name Format
-            
-            # Check if we have enough data to read type length
+            type_length, payload_length = _SR_LENGTHS.unpack_from(data, offset)
+            offset += 2
+        else:
+            if offset + 5 > len(data):
+                break
+            type_length, payload_length = _LONG_LENGTHS.unpack_from(data, offset)
+            offset += 5
+        
+        # ID Length and ID (if present)
+        id_length = 0
+        id_value = b''
+        if il:
             if offset >= len(data):
                 break
-                
-            type_length = data[offset]
+            id_length = data[offset]
             offset += 1
             
-            # Payload length - short record (1 byte) or normal (4 bytes)
-            if sr:
-                if offset >= len(data):
-                    break
-                payload_length = data[offset]
-                offset += 1
-            else:
-                if offset + 3 >= len(data):
-                    break
-                payload_length = struct.unpack('>I', data[offset:offset+4])[0]
-                offset += 4
-            
-            # ID Length and ID (if present)
-            id_length = 0
-            id_value = b''
-            if il:
-                if offset >= len(data):
+            if id_length > 0:
+                if offset + id_length > len(data):
                     break
-                id_length = data[offset]
-                offset += 1
-                
-                if id_length > 0:
-                    if offset + id_length > len(data):
-                        break
-                    id_value = data[offset:offset+id_length]
-                    offset += id_length
-            
-            # Type
-            type_value = b''
-            if type_length > 0:
-                if offset + type_length > len(data):
-                    break
-                type_value = data[offset:offset+type_length]
-                offset += type_length
-            
-            # Payload
-            payload = b''
-            if payload_length > 0:
-                if offset + payload_length > len(data):
-                    break
-                payload = data[offset:offset+payload_length]
-                offset += payload_length
-            
-            # Create record dict
-            record = {
-                'type_name_format': tnf,
-                'type': type_value,
-                'id': id_value,
-                'payload': payload
-            }
-            
-            # Process well-known types
-            if tnf == NDEF_TNF_WELL_KNOWN:
-                if type_value == NDEF_RTD_TEXT:
-                    # Text record
-                    status_byte = payload[0]
-                    language_code_length = status_byte & 0x3F
-                    encoding = 'utf-16' if (status_byte & 0x80) else 'utf-8'
-                    
-                    language_code = payload[1:1+language_code_length].decode('ascii')
-                    text = payload[1+language_code_length:].decode(encoding)
-                    
-                    record['decoded'] = {
-                        'type': 'text',
-                        'language': language_code,
-                        'encoding': encoding,
-                        'text': text
-                    }
-                    
-                elif type_value == NDEF_RTD_URI:
-                    # URI record
-                    prefix_index = payload[0]
-                    prefix = URI_PREFIXES[prefix_index] if prefix_index < len(URI_PREFIXES) else ''
-                    uri = prefix + payload[1:].decode('utf-8')
-                    
-                    record['decoded'] = {
-                        'type': 'uri',
-                        'uri': uri
-                    }
-            
-            result['records'].append(record)
-            
-            # If this was the end of the message, stop parsing
-            if me:
+                id_value = bytes(data[offset:offset+id_length])
+                offset += id_length
+        
+        # Type
+        type_value = b''
+        if type_length > 0:
+            if offset + type_length > len(data):
                 break
+            type_value = bytes(data[offset:offset+type_length])
+            offset += type_length
         
-        return result
+        # Payload
+        payload = b''
+        if payload_length > 0:
+            if offset + payload_length > len(data):
+                break
+            payload = bytes(data[offset:offset+payload_length])
+            offset += payload_length
         
-    except Exception as e:
-        logger.error(f"Error parsing NDEF data: {str(e)}")
-        return None
+        # Create record dict
+        record = {
+            'type_name_format': tnf,
+            'type': type_value,
+            'id': id_value,
+            'payload': payload
+        }
+        
+        # Process well-known types
+        if tnf == NDEF_TNF_WELL_KNOWN:
+            decoder = _RTD_DECODERS.get(type_value)
+            if decoder:
+                # Malformed payloads only lose the decoded view; the raw record is kept
+                try:
+                    decoded = decoder(payload)
+                except UnicodeDecodeError as e:
+                    logger.warning("Error decoding well-known NDEF record of type %r: %s", type_value, e)
+                else:
+                    if decoded is not None:
+                        record['decoded'] = decoded
+                    else:
+                        logger.debug("Well-known NDEF record of type %r has a truncated payload", type_value)
+        
+        yield record
+        
+        # If this was the end of the message, stop parsing
+        if me:
+            break
+
+def _https_uri_tlv(tail):
+    """
+    Internal helper building the block-padded TLV for a lone https:// URI record.
+
+    Produces exactly the bytes the generic create_ndef_data() path would.
+
+    Args:
+        tail (bytes): UTF-8 encoded URL with the 'https://' prefix removed
+
+    Returns:
+        bytes: NDEF formatted data ready for writing
+    """
+    tlv = bytearray(_HTTPS_URI_TEMPLATE)
+    tlv += tail
+    tlv[1] = len(tlv) - 2  # TLV length: everything after the TLV header
+    tlv[4] = len(tail) + 1  # Payload length: prefix code + URI tail
+    
+    # Terminator TLV only if the message leaves room in the first block
+    if len(tlv) < 16:
+        tlv.append(0xFE)
+    
+    # Pad with zeros to a whole number of 16-byte blocks (none if already aligned)
+    tlv += bytes(-len(tlv) & 15)
+    
+    return bytes(tlv)
 
 def create_ndef_data(url=None, text=None):
     """
     Create NDEF formatted data for writing to tag.
 
     Args:
-        url (str, optional): URL to encode
+        url (str or bytes, optional): URL to encode (bytes are taken as UTF-8)
         text (str, optional): Text to encode
 
     Returns:
@@ -302,25 +422,37 @@ def create_ndef_data(url=None, text=None):
     if not url and not text:
         raise ValueError("Either url or text must be provided")
     
-    records = []
+    # Encode once; prefix matching below works on the encoded bytes
+    if isinstance(url, str):
+        url = url.encode('utf-8')
+    
+    # The common single https:// URL is spliced into a prebuilt header
+    # instead of assembling the record and TLV piece by piece
+    if url and not text and url.startswith(b'https://') and not url.startswith(b'https://www.'):
+        tail = url[8:]
+        if len(tail) <= _HTTPS_URI_MAX_TAIL:
+            return _https_uri_tlv(tail)
+    
+    # Records are appended straight into one message buffer
+    ndef_message = bytearray()
     
     if url:
         # Create URI record
         try:
-            # Find the best matching prefix
+            # Find the longest matching prefix
             prefix_index = 0
-            for i, prefix in enumerate(URI_PREFIXES):
-                if prefix and url.startswith(prefix):
+            for i, prefix in _URI_PREFIX_GROUPS.get(url[:4], ()):
+                if url.startswith(prefix):
                     prefix_index = i
                     url = url[len(prefix):]  # Remove prefix from URL
                     break
             
             # Create payload with prefix index + URI
-            payload = bytes([prefix_index]) + url.encode('utf-8')
+            payload = bytes([prefix_index]) + url
             
             # Create NDEF record
             header = 0
-            if len(records) == 0:
+            if not ndef_message:
                 header |= 0x80  # Message Begin
             if not text:  # If this is the only/last record
                 header |= 0x40  # Message End
@@ -337,19 +469,19 @@ def create_ndef_data(url=None, text=None):
             
             # Create record header
             if header & 0x10:  # Short Record
-                record = bytes([header, type_length, payload_length])
+                ndef_message += _SR_RECORD_HEADER.pack(header, type_length, payload_length)
             else:
                 # Long record format with 4-byte length
-                record = bytes([header, type_length]) + payload_length.to_bytes(4, byteorder='big')
+                ndef_message += _LONG_RECORD_HEADER.pack(header, type_length, payload_length)
             
             # Add type and payload
-            record += type_field + payload
-            records.append(record)
+            ndef_message += type_field
+            ndef_message += payload
             
-            logger.debug(f"Created URI record with {len(payload)} bytes of payload data")
+            logger.debug("Created URI record with %s bytes of payload data", len(payload))
             
         except Exception as e:
-            logger.error(f"Error creating URI record: {str(e)}")
+            logger.error("Error creating URI record: %s", e)
             raise NFCError(f"Failed to create URI record: {str(e)}")
     
     if text:
@@ -365,7 +497,7 @@ def create_ndef_data(url=None, text=None):
             
             # Create NDEF record
             header = 0
-            if len(records) == 0:
+            if not ndef_message:
                 header |= 0x80  # Message Begin
             header |= 0x40  # Message End (always the last record)
             header |= 0x10  # Short Record (payload less than 256 bytes)
@@ -375,41 +507,42 @@ def create_ndef_data(url=None, text=None):
             type_length = len(type_field)
             payload_length = len(payload)
             
-            record = bytes([header, type_length, payload_length]) + type_field + payload
-            records.append(record)
+            ndef_message += _SR_RECORD_HEADER.pack(header, type_length, payload_length)
+            ndef_message += type_field
+            ndef_message += payload
             
         except Exception as e:
-            logger.error(f"Error creating Text record: {str(e)}")
+            logger.error("Error creating Text record: %s", e)
             raise NFCError(f"Failed to create Text record: {str(e)}")
     
-    # Combine all records into a single message
-    ndef_message = b''.join(records)
-    
     # For NTAG215, we need to create proper Type 2 Tag structure with TLV format
     # This is a simple Type 2 Tag TLV structure used by NTAG215
-    tlv_type = bytes([0x03])  # NDEF Message TLV
+    message_length = len(ndef_message)
     
     # Handle TLV length properly - for lengths > 254, we need to use a 3-byte format
-    message_length = len(ndef_message)
+    tlv_header_length = 2 if message_length < 255 else 4
+    tlv_length = tlv_header_length + message_length
+    
+    # Size the buffer once: TLV, a terminator TLV if there's room in the first
+    # block, then zero padding up to a whole number of 16-byte blocks
+    # (bytearray is zero-filled, so the padding needs no writes)
+    total_length = tlv_length + 1 if tlv_length < 16 else tlv_length
+    tlv_data = bytearray((total_length + 15) & ~15)
     
-    if message_length < 255:
+    tlv_data[0] = 0x03  # NDEF Message TLV
+    if tlv_header_length == 2:
         # Standard 1-byte length format
-        tlv_length = bytes([message_length])
-        tlv_data = tlv_type + tlv_length + ndef_message
+        tlv_data[1] = message_length
     else:
         # 3-byte length format for lengths >= 255
-        tlv_length = bytes([0xFF]) + message_length.to_bytes(2, byteorder='big')
-        tlv_data = tlv_type + tlv_length + ndef_message
-        logger.debug(f"Using 3-byte TLV length format for message length {message_length}")
+        tlv_data[1] = 0xFF
+        tlv_data[2:4] = message_length.to_bytes(2, byteorder='big')
+        logger.debug("Using 3-byte TLV length format for message length %s", message_length)
     
-    # Add a terminator TLV if needed
-    if len(tlv_data) < 16:  # If there's room in the first block
-        tlv_data += bytes([0xFE])  # Terminator TLV
+    # Copy the message in place
+    tlv_data[tlv_header_length:tlv_length] = ndef_message
     
-    # Ensure it fits into a 16-byte block (or multiple blocks)
-    # Pad with zeros if needed
-    if len(tlv_data) % 16 != 0:
-        padding_bytes = 16 - (len(tlv_data) % 16)
-        tlv_data += b'\x00' * padding_bytes
+    if tlv_length < 16:
+        tlv_data[tlv_length] = 0xFE  # Terminator TLV
     
-    return tlv_data
+    return bytes(tlv_data)
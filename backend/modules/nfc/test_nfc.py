@@ -18,7 +18,7 @@ parser = argparse.ArgumentParser(description="Test NFC hardware and module funct
 parser.add_argument('-b', '--bus', type=int, default=1, help="I2C bus number (default: 1)")
 parser.add_argument('-a', '--address', type=int, default=0x24, help="I2C device address (default: 0x24)")
 parser.add_argument('-t', '--test', type=str, default='all', 
-                    choices=['hardware', 'detect', 'readwrite', 'ndef', 'poll', 'all'],
+                    choices=['hardware', 'detect', 'readwrite', 'ndef', 'poll', 'internals', 'processing', 'all'],
                     help="Test to run (default: all)")
 parser.add_argument('-d', '--duration', type=int, default=10, help="Duration in seconds for polling tests (default: 10)")
 parser.add_argument('-v', '--verbose', action='store_true', help="Enable verbose debugging output")
@@ -61,12 +61,14 @@ try:
     shutdown = nfc_controller.shutdown
     poll_for_tag = nfc_controller.poll_for_tag
     read_tag_data = nfc_controller.read_tag_data
+    read_tag_blocks = nfc_controller.read_tag_blocks
     write_tag_data = nfc_controller.write_tag_data
     get_hardware_info = nfc_controller.get_hardware_info
     authenticate_tag = nfc_controller.authenticate_tag
     read_ndef_data = nfc_controller.read_ndef_data
     write_ndef_data = nfc_controller.write_ndef_data
     continuous_poll = nfc_controller.continuous_poll
+    get_reader = nfc_controller.get_reader
     NFCError = exceptions.NFCError
     NFCNoTagError = exceptions.NFCNoTagError
     
@@ -87,12 +89,14 @@ except ImportError:
         shutdown = nfc_controller.shutdown
         poll_for_tag = nfc_controller.poll_for_tag
         read_tag_data = nfc_controller.read_tag_data
+        read_tag_blocks = nfc_controller.read_tag_blocks
         write_tag_data = nfc_controller.write_tag_data
         get_hardware_info = nfc_controller.get_hardware_info
         authenticate_tag = nfc_controller.authenticate_tag
         read_ndef_data = nfc_controller.read_ndef_data
         write_ndef_data = nfc_controller.write_ndef_data
         continuous_poll = nfc_controller.continuous_poll
+        get_reader = nfc_controller.get_reader
         NFCError = exceptions.NFCError
         NFCNoTagError = exceptions.NFCNoTagError
         
@@ -116,13 +120,55 @@ except ImportError:
         print("===========================\n")
         sys.exit(1)
 
+# GPIO (BCM) wired to the PN532 IRQ line, if any; tag waits sleep on it instead of polling
+IRQ_PIN = int(os.environ['NFC_IRQ_GPIO']) if os.environ.get('NFC_IRQ_GPIO') else None
+
+def wait_for_tag(timeout=5.0):
+    """
+    Wait for a tag to be placed on the reader.
+    
+    Sleeps until the PN532 IRQ fires when one is configured (NFC_IRQ_GPIO),
+    otherwise polls every 50 ms, backing off to 500 ms once the reader has been
+    idle for 2 seconds.
+    
+    Args:
+        timeout (float): Maximum time to wait in seconds
+        
+    Returns:
+        str or None: Tag UID if detected within the timeout, None otherwise
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    interval = 0.05
+    reader = get_reader()
+    while True:
+        uid = poll_for_tag()
+        if uid:
+            return uid
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        
+        if reader.irq_enabled:
+            try:
+                reader.listen_for_tag()
+                reader.wait_for_irq(remaining)
+                continue
+            except NFCError as e:
+                logger.debug(f"IRQ wait failed, polling instead: {e}")
+        
+        time.sleep(min(interval, remaining))
+        if time.monotonic() - start > 2.0:
+            interval = min(interval * 1.5, 0.5)
+
 def test_hardware_connection(i2c_bus=1, i2c_address=0x24):
     """Test connecting to the NFC hardware."""
     print("\n=== Testing Hardware Connection ===")
     
     try:
         # Initialize NFC controller
-        success = initialize(i2c_bus, i2c_address)
+        success = initialize(i2c_bus, i2c_address, irq_pin=IRQ_PIN)
         if not success:
             print("❌ Failed to initialize NFC controller")
             return False
@@ -161,26 +207,17 @@ def test_tag_detection(i2c_bus=1, i2c_address=0x24, poll_time=10):
     
     try:
         # Initialize NFC controller
-        if not initialize(i2c_bus, i2c_address):
+        if not initialize(i2c_bus, i2c_address, irq_pin=IRQ_PIN):
             print("❌ Failed to initialize NFC controller")
             return False
         
-        # Poll for tag for specified time
-        start_time = time.time()
-        detected = False
-        
-        while time.time() - start_time < poll_time:
-            uid = poll_for_tag()
-            if uid:
-                print(f"✅ Tag detected! UID: {uid}")
-                detected = True
-                # Exit after detection
-                break
-            
-            # Sleep between polls
-            time.sleep(0.1)
+        # Wait for a tag for the specified time
+        uid = wait_for_tag(poll_time)
+        detected = uid is not None
         
-        if not detected:
+        if detected:
+            print(f"✅ Tag detected! UID: {uid}")
+        else:
             print("❌ No tag detected within the polling time")
         
         # Shutdown to clean up
@@ -204,24 +241,19 @@ def test_read_write(i2c_bus=1, i2c_address=0x24, block=4):
     
     try:
         # Initialize NFC controller
-        if not initialize(i2c_bus, i2c_address):
+        if not initialize(i2c_bus, i2c_address, irq_pin=IRQ_PIN):
             print("❌ Failed to initialize NFC controller")
             return False
         
-        # Wait for tag
-        uid = None
-        for _ in range(50):  # Try for ~5 seconds
-            uid = poll_for_tag()
-            if uid:
-                print(f"✅ Tag detected! UID: {uid}")
-                break
-            time.sleep(0.1)
-        
+        # Wait for tag (up to 5 seconds)
+        uid = wait_for_tag(5.0)
         if not uid:
             print("❌ No tag detected")
             shutdown()
             return False
         
+        print(f"✅ Tag detected! UID: {uid}")
+        
         # Read initial data
         try:
             print(f"Reading data from block {block}...")
@@ -308,24 +340,19 @@ def test_ndef_data(i2c_bus=1, i2c_address=0x24):
     
     try:
         # Initialize NFC controller
-        if not initialize(i2c_bus, i2c_address):
+        if not initialize(i2c_bus, i2c_address, irq_pin=IRQ_PIN):
             print("❌ Failed to initialize NFC controller")
             return False
         
-        # Wait for tag
-        uid = None
-        for _ in range(50):  # Try for ~5 seconds
-            uid = poll_for_tag()
-            if uid:
-                print(f"✅ Tag detected! UID: {uid}")
-                break
-            time.sleep(0.1)
-        
+        # Wait for tag (up to 5 seconds)
+        uid = wait_for_tag(5.0)
         if not uid:
             print("❌ No tag detected")
             shutdown()
             return False
         
+        print(f"✅ Tag detected! UID: {uid}")
+        
         # First, read any existing NDEF data
         try:
             print("Reading current NDEF data...")
@@ -443,15 +470,13 @@ def test_ndef_data(i2c_bus=1, i2c_address=0x24):
                 
                 # Show raw data for deeper debugging
                 print(f"\nRaw NDEF data from tag (first 64 bytes, hex):")
-                raw_data = read_tag_data(4)  # Read first block of NDEF data
-                print(f"Block 4: {raw_data.hex()}")
-                
-                # Try to read additional blocks
                 try:
-                    raw_data2 = read_tag_data(5)
-                    print(f"Block 5: {raw_data2.hex()}")
+                    # Blocks 4-7 in one multi-block read
+                    raw_data = read_tag_blocks(4, 4)
+                    for i in range(4):
+                        print(f"Block {4 + i}: {raw_data[i * 16:(i + 1) * 16].hex()}")
                 except Exception as e:
-                    print(f"Could not read Block 5: {str(e)}")
+                    print(f"Could not read Blocks 4-7: {str(e)}")
         except Exception as e:
             print(f"❌ Error during NDEF URL test: {str(e)}")
         
@@ -477,7 +502,7 @@ def test_continuous_poll(i2c_bus=1, i2c_address=0x24, duration=10):
     
     try:
         # Initialize NFC controller
-        if not initialize(i2c_bus, i2c_address):
+        if not initialize(i2c_bus, i2c_address, irq_pin=IRQ_PIN):
             print("❌ Failed to initialize NFC controller")
             return False
             
@@ -488,10 +513,12 @@ def test_continuous_poll(i2c_bus=1, i2c_address=0x24, duration=10):
         # Set up exit event for the continuous poll
         exit_event = threading.Event()
         
-        # Start continuous polling in a separate thread
+        # Start continuous polling in a separate thread; it polls every 50 ms
+        # after activity and backs off to 500 ms while no tag is present
         poll_thread = threading.Thread(
             target=continuous_poll,
-            args=(tag_callback, 0.1, exit_event)
+            args=(tag_callback, 0.05, exit_event),
+            kwargs={'max_interval': 0.5}
         )
         poll_thread.daemon = True
         poll_thread.start()
@@ -520,13 +547,219 @@ def test_continuous_poll(i2c_bus=1, i2c_address=0x24, duration=10):
             pass
         return False
 
+def _check(description, passed):
+    """Print the outcome of one offline check and return it."""
+    print(f"{'✅' if passed else '❌'} {description}")
+    return passed
+
+def test_controller_internals():
+    """Test the controller's locking and buffering helpers (no hardware needed)."""
+    print("\n=== Testing Controller Internals ===")
+    results = []
+    
+    # Readers-writer lock: shared read side, exclusive write side
+    lock = nfc_controller._RWLock()
+    
+    second_reader = threading.Event()
+    def reader():
+        with lock.read_lock():
+            second_reader.set()
+    with lock.read_lock():
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+        results.append(_check("Two readers hold the read side together", second_reader.wait(1.0)))
+    thread.join(timeout=1.0)
+    
+    writer_in = threading.Event()
+    def writer():
+        with lock.write_lock():
+            writer_in.set()
+    with lock.read_lock():
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        results.append(_check("Writer waits while a reader holds the lock", not writer_in.wait(0.2)))
+    results.append(_check("Writer proceeds once the reader releases", writer_in.wait(1.0)))
+    thread.join(timeout=1.0)
+    
+    reader_in = threading.Event()
+    def late_reader():
+        with lock.read_lock():
+            reader_in.set()
+    with lock.write_lock():
+        # The writing thread may re-enter both sides
+        with lock.write_lock(), lock.read_lock():
+            pass
+        thread = threading.Thread(target=late_reader, daemon=True)
+        thread.start()
+        results.append(_check("Reader waits while the writer (re-entered) holds the lock", not reader_in.wait(0.2)))
+    results.append(_check("Reader proceeds once the writer releases", reader_in.wait(1.0)))
+    thread.join(timeout=1.0)
+    
+    # Callback event ring: FIFO order, drops new items when full
+    ring = nfc_controller._SPSCRing(4)
+    results.append(_check("Empty ring returns None", ring.get() is None))
+    accepted = [ring.put(i) for i in range(5)]
+    results.append(_check("Full ring rejects the fifth item", accepted == [True, True, True, True, False]))
+    results.append(_check("Ring hands items out in order", [ring.get() for _ in range(5)] == [0, 1, 2, 3, None]))
+    
+    # Indices keep running past the buffer size without losing items
+    for i in range(10):
+        ring.put(i)
+        if ring.get() != i:
+            break
+    results.append(_check("Ring wraps around its buffer", i == 9 and ring.get() is None))
+    
+    # Producer and consumer on separate threads see every item exactly once
+    ring = nfc_controller._SPSCRing(16)
+    received = []
+    def consumer():
+        while len(received) < 1000:
+            item = ring.get()
+            if item is None:
+                ring.ready.wait(0.01)
+                ring.ready.clear()
+            else:
+                received.append(item)
+    thread = threading.Thread(target=consumer, daemon=True)
+    thread.start()
+    for i in range(1000):
+        while not ring.put(i):
+            time.sleep(0.0001)
+    thread.join(timeout=5.0)
+    results.append(_check("Items cross threads in order without loss", received == list(range(1000))))
+    
+    # Ranged write verify: locate the first 16-byte block that differs
+    expected = bytes(range(48))
+    first_mismatch = nfc_controller._first_mismatched_block
+    results.append(_check("Mismatch in the first block is block 0",
+                          first_mismatch(b'\xff' + expected[1:], expected) == 0))
+    results.append(_check("Mismatch in the last byte is block 2",
+                          first_mismatch(expected[:47] + b'\xff', expected) == 2))
+    results.append(_check("Earliest of several mismatches is reported",
+                          first_mismatch(expected[:20] + b'\xff' * 28, expected) == 1))
+    results.append(_check("Block missing from a short read-back is reported",
+                          first_mismatch(expected[:32], expected) == 2))
+    
+    passed = all(results)
+    print(f"\n{'✅ All' if passed else '❌ Some'} controller internals checks {'passed' if passed else 'failed'}")
+    return passed
+
+def test_tag_processing():
+    """Test NDEF encoding and parsing in tag_processor (no hardware needed)."""
+    print("\n=== Testing Tag Processing ===")
+    results = []
+    prefixes = tag_processor.URI_PREFIXES
+    
+    def first_record(data):
+        parsed = tag_processor.parse_ndef_data(data)
+        return parsed['records'][0] if parsed and parsed['records'] else None
+    
+    # Every URI prefix is encoded with the longest matching prefix code
+    # (e.g. 'urn:epc:id:' rather than 'urn:') and decodes back unchanged
+    wrong = []
+    for prefix in prefixes[1:]:
+        url = prefix + 'example'
+        expected_code = max((i for i, p in enumerate(prefixes) if url.startswith(p)),
+                            key=lambda i: len(prefixes[i]))
+        record = first_record(tag_processor.create_ndef_data(url=url))
+        if (not record or record['payload'][0] != expected_code
+                or record.get('decoded', {}).get('uri') != url):
+            wrong.append(prefix)
+    results.append(_check(f"All {len(prefixes) - 1} URI prefixes use the longest match and round-trip",
+                          not wrong))
+    if wrong:
+        print(f"   Mismatched prefixes: {wrong}")
+    
+    # URLs without a known prefix, or shorter than any prefix, are stored whole
+    for url in ('example.com/page', 'ab'):
+        record = first_record(tag_processor.create_ndef_data(url=url))
+        results.append(_check(f"'{url}' is stored with prefix code 0x00",
+                              record is not None and record['payload'] == b'\x00' + url.encode()))
+    
+    # Each prefix is a candidate in exactly the group of its first 4 bytes
+    grouped = sorted(i for candidates in tag_processor._URI_PREFIX_GROUPS.values() for i, _ in candidates)
+    in_own_group = all(
+        any(i == j for j, _ in tag_processor._URI_PREFIX_GROUPS[prefix[:4].encode()])
+        for i, prefix in enumerate(prefixes) if prefix
+    )
+    results.append(_check("Every URI prefix is grouped once, under its first 4 bytes",
+                          grouped == list(range(1, len(prefixes))) and in_own_group))
+    
+    # Malformed payloads keep the raw record but get no decoded view
+    bad_uri = tag_processor.parse_ndef_data(bytes([0x03, 0x07, 0xD1, 0x01, 0x03, 0x55, 0x04, 0xFF, 0xFE, 0xFE]))
+    results.append(_check("Non-UTF-8 URI record is kept without 'decoded'",
+                          bad_uri is not None and len(bad_uri['records']) == 1
+                          and bad_uri['records'][0]['payload'] == b'\x04\xff\xfe'
+                          and 'decoded' not in bad_uri['records'][0]))
+    
+    short_lang = first_record(bytes([0x03, 0x06, 0xD1, 0x01, 0x02, 0x54, 0x05, 0x65, 0xFE]))
+    results.append(_check("Text record with a truncated language code has no 'decoded'",
+                          short_lang is not None and 'decoded' not in short_lang))
+    
+    # A record whose payload runs past the end of the data is dropped, earlier records are kept
+    truncated = tag_processor.parse_ndef_data(bytes([
+        0x03, 0x0F,
+        0x91, 0x01, 0x03, 0x55, 0x04, 0x61, 0x62,  # URI 'https://ab'
+        0x51, 0x01, 0x14, 0x54, 0x02, 0x65, 0x6E, 0x78,  # Text claiming 20 payload bytes
+    ]))
+    results.append(_check("Truncated record is dropped after the complete ones",
+                          truncated is not None and len(truncated['records']) == 1
+                          and truncated['records'][0].get('decoded', {}).get('uri') == 'https://ab'))
+    
+    # Messages over 254 bytes use the 3-byte TLV length (0xFF + 2-byte big-endian length)
+    long_url = 'https://example.com/' + 'a' * 200
+    long_text = 'x' * 200
+    long_data = tag_processor.create_ndef_data(url=long_url, text=long_text)
+    tlv_length = int.from_bytes(long_data[2:4], 'big')
+    parsed = tag_processor.parse_ndef_data(long_data)
+    decoded = [r.get('decoded', {}) for r in parsed['records']] if parsed else []
+    results.append(_check("Long message uses the 3-byte TLV length and round-trips",
+                          long_data[:2] == b'\x03\xff' and tlv_length > 254
+                          and len(decoded) == 2
+                          and decoded[0].get('uri') == long_url
+                          and decoded[1].get('text') == long_text))
+    
+    # Record header flags and length fields come from precomputed tables
+    results.append(_check("Header 0xD1 decodes to MB, ME, SR and well-known TNF",
+                          tag_processor._NDEF_HEADER_FLAGS[0xD1] == (True, True, False, True, False, 1)))
+    results.append(_check("Header 0x59 decodes to ME, SR, IL and well-known TNF",
+                          tag_processor._NDEF_HEADER_FLAGS[0x59] == (False, True, False, True, True, 1)))
+    
+    short_data = tag_processor.create_ndef_data(url='https://example.com')
+    results.append(_check("Short URI record has an SR header with 1-byte lengths",
+                          short_data[2] == 0xD1
+                          and tag_processor._SR_LENGTHS.unpack_from(short_data, 3) == (1, 12)))
+    
+    long_payload_length = 1 + len('example.com/') + 300
+    long_data = tag_processor.create_ndef_data(url='https://example.com/' + 'a' * 300)
+    results.append(_check("Long URI record has a normal header with a 4-byte payload length",
+                          long_data[4] == 0xC1
+                          and tag_processor._LONG_LENGTHS.unpack_from(long_data, 5) == (1, long_payload_length)))
+    
+    # Well-known records are decoded by type; unknown types are kept undecoded
+    text_record = first_record(tag_processor.create_ndef_data(text='hello'))
+    uri_record = first_record(tag_processor.create_ndef_data(url='tel:123'))
+    results.append(_check("Text and URI records use their own decoders",
+                          text_record is not None and text_record.get('decoded', {}).get('type') == 'text'
+                          and uri_record is not None and uri_record.get('decoded', {}).get('type') == 'uri'))
+    
+    unknown = first_record(bytes([0x03, 0x08, 0xD1, 0x02, 0x03, 0x53, 0x70, 0x61, 0x62, 0x63, 0xFE]))
+    results.append(_check("Unknown well-known type is kept without 'decoded'",
+                          unknown is not None and unknown['type'] == b'Sp'
+                          and unknown['payload'] == b'abc' and 'decoded' not in unknown))
+    
+    passed = all(results)
+    print(f"\n{'✅ All' if passed else '❌ Some'} tag processing checks {'passed' if passed else 'failed'}")
+    return passed
+
 def main():
     """Main function to run the tests."""
     parser = argparse.ArgumentParser(description='Test the NFC module functionality')
     parser.add_argument('-b', '--bus', type=int, default=1, help='I2C bus number (default: 1)')
     parser.add_argument('-a', '--address', type=int, default=0x24, help='I2C device address (default: 0x24)', 
                         metavar='ADDR')
-    parser.add_argument('-t', '--test', type=str, choices=['all', 'hardware', 'detect', 'readwrite', 'ndef', 'poll'], 
+    parser.add_argument('-t', '--test', type=str, choices=['all', 'hardware', 'detect', 'readwrite', 'ndef', 'poll', 'internals',
+                                                 'processing'], 
                         default='all', help='Test to run (default: all)')
     parser.add_argument('-d', '--duration', type=int, default=10, 
                         help='Duration in seconds for polling tests (default: 10)')
@@ -567,6 +800,12 @@ def main():
     if args.test == 'all' or args.test == 'poll':
         test_continuous_poll(args.bus, i2c_address, args.duration)
     
+    if args.test == 'all' or args.test == 'internals':
+        test_controller_internals()
+    
+    if args.test == 'all' or args.test == 'processing':
+        test_tag_processing()
+    
     print("\n===========================================")
     print("          Test Script Completed           ")
     print("===========================================")